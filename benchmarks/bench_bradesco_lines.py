@@ -0,0 +1,122 @@
+"""
+Compares the line-parsing throughput of the Bradesco parser against the
+original per-line implementation on a synthetic statement.
+
+Run with: python -m benchmarks.bench_bradesco_lines [line_count]
+"""
+
+import random
+import re
+import sys
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterator, Optional
+from statement_ingestor.bradesco_credit_card_parser import _parse_lines
+from statement_ingestor.models import Transaction
+
+
+def synthetic_lines(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    lines = ["Data de Vencimento Total da Fatura R$", "VENCIMENTO 01/04/2025"]
+    while len(lines) < count:
+        roll = rng.random()
+        if roll < 0.02:
+            lines.append(f"JOHN DOE Cartão 4066 XXXX XXXX {rng.randint(0, 9999):04d}")
+        elif roll < 0.25:
+            lines.append("* Pontuação consolidada de todos os cartões do Associado.")
+        else:
+            amount = f"{rng.randint(1, 99999) / 100:,.2f}"
+            amount = amount.replace(",", "_").replace(".", ",").replace("_", ".")
+            lines.append(
+                f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d} "
+                f"LOJA {rng.randint(1, 500)} RIO DE JANEIRO {amount}"
+                + ("-" if roll > 0.97 else "")
+            )
+    return lines
+
+
+def legacy_parse_lines(lines: list[str]) -> Iterator[Transaction]:
+    """The parsing loop as it was before the single-pass classifier."""
+    due_date = _legacy_extract_due_date(lines)
+    current_card_number = "0000"
+    for line in lines:
+        if card_number := _legacy_extract_card_number(line):
+            current_card_number = card_number
+        if bool(re.match(r"^\d{2}/\d{2}\s+.*?\s+[\d.,]+-?", line)):
+            account_id = f"bradesco_credit_card_{current_card_number}"
+            transaction = _legacy_parse_transaction(line, account_id, due_date)
+            if transaction:
+                yield transaction
+
+
+def _legacy_parse_transaction(
+    line: str, account_id: str, due_date: Optional[date]
+) -> Optional[Transaction]:
+    match = re.match(
+        r"""(?P<date>\d{2}/\d{2})\s+
+        (?P<description>.*?)\s+
+        (?P<amount>[\d.,]+-?)""",
+        line,
+        re.VERBOSE,
+    )
+    if not match:
+        return None
+    date_str = match.group("date")
+    amount_str = match.group("amount")
+    if amount_str.endswith("-"):
+        amount_str = "-" + amount_str[:-1]
+    transaction_year = datetime.now().year
+    if due_date:
+        transaction_month = int(date_str.split("/")[1])
+        if transaction_month > due_date.month:
+            transaction_year = due_date.year - 1
+        else:
+            transaction_year = due_date.year
+    return Transaction(
+        date=datetime.strptime(f"{date_str}/{transaction_year}", "%d/%m/%Y").date(),
+        description=match.group("description"),
+        amount=float(Decimal(amount_str.replace(".", "").replace(",", "."))),
+        currency="BRL",
+        account_id=account_id,
+    )
+
+
+def _legacy_extract_due_date(lines: list[str]) -> Optional[date]:
+    for line in lines:
+        if "VENCIMENTO" in line.upper():
+            match = re.search(r"(\d{2}/\d{2}/\d{4})", line)
+            if match:
+                return datetime.strptime(match.group(1), "%d/%m/%Y").date()
+    return None
+
+
+def _legacy_extract_card_number(line: str) -> Optional[str]:
+    match = re.search(r".*Cartão\s+\d{4}\s+XXXX\s+XXXX\s+(\d{4})", line)
+    return match.group(1) if match else None
+
+
+def _lines_per_second(parse, lines: list[str], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in parse(lines):
+            pass
+        best = min(best, time.perf_counter() - started)
+    return len(lines) / best
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    lines = synthetic_lines(count)
+    assert list(legacy_parse_lines(lines)) == list(_parse_lines(lines))
+
+    before = _lines_per_second(legacy_parse_lines, lines)
+    after = _lines_per_second(_parse_lines, lines)
+    print(f"lines: {len(lines)}")
+    print(f"before: {before:,.0f} lines/s")
+    print(f"after:  {after:,.0f} lines/s ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
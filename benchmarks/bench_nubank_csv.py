@@ -0,0 +1,86 @@
+"""
+Compares the Nubank CSV parsers against the original DictReader/strptime
+implementation on synthetic exports.
+
+Run with: python -m benchmarks.bench_nubank_csv [row_count]
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Iterator
+from benchmarks.generators import write_bank_csv, write_card_csv
+from statement_ingestor import NubankBankParser, NubankCreditCardParser
+from statement_ingestor.models import Transaction
+
+
+def legacy_bank_transactions(file_path: str) -> Iterator[Transaction]:
+    with open(file_path, "r", encoding="utf-8") as infile:
+        for row in csv.DictReader(infile):
+            yield Transaction(
+                date=datetime.strptime(row["Data"], "%d/%m/%Y").date(),
+                description=row["Descrição"],
+                amount=float(row["Valor"]),
+                currency="BRL",
+                account_id="nubank_bank_0000",
+            )
+
+
+def legacy_card_transactions(file_path: str) -> Iterator[Transaction]:
+    with open(file_path, "r", encoding="utf-8") as infile:
+        for row in csv.DictReader(infile):
+            yield Transaction(
+                date=datetime.strptime(row["date"], "%Y-%m-%d").date(),
+                description=row["title"],
+                amount=float(row["amount"]),
+                currency="BRL",
+                account_id="nubank_card_0000",
+            )
+
+
+def _rows_per_second(
+    iter_transactions: Callable[[str], Iterator[Transaction]],
+    path: str,
+    rows: int,
+    repeat: int = 3,
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in iter_transactions(path):
+            pass
+        best = min(best, time.perf_counter() - started)
+    return rows / best
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as directory:
+        bank_path = os.path.join(directory, "bank.csv")
+        card_path = os.path.join(directory, "card.csv")
+        write_bank_csv(bank_path, rows)
+        write_card_csv(card_path, rows)
+
+        cases = [
+            ("nubank bank", bank_path, legacy_bank_transactions, NubankBankParser()),
+            (
+                "nubank card",
+                card_path,
+                legacy_card_transactions,
+                NubankCreditCardParser(),
+            ),
+        ]
+        for name, path, legacy, parser in cases:
+            assert list(legacy(path)) == list(parser.iter_transactions(path))
+            before = _rows_per_second(legacy, path, rows)
+            after = _rows_per_second(parser.iter_transactions, path, rows)
+            print(
+                f"{name}: {before:,.0f} -> {after:,.0f} rows/s ({after / before:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
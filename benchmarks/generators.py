@@ -0,0 +1,76 @@
+"""
+Deterministic synthetic statements for the benchmarks: the same size and seed
+always produce the same file.
+"""
+
+import csv
+import random
+from datetime import date, timedelta
+from benchmarks.pdf_factory import build_pdf
+
+_ROWS_PER_PAGE = 50
+
+
+def write_bank_csv(path: str, rows: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    with open(path, "w", encoding="utf-8", newline="") as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(["Data", "Valor", "Identificador", "Descrição"])
+        for index in range(rows):
+            day = start + timedelta(days=index * 1500 // rows)
+            writer.writerow(
+                [
+                    day.strftime("%d/%m/%Y"),
+                    f"{rng.randint(-999999, 999999) / 100:.2f}",
+                    f"{rng.getrandbits(128):032x}",
+                    f"Transferência enviada pelo Pix - Pessoa {rng.randint(1, 999)}",
+                ]
+            )
+
+
+def write_card_csv(path: str, rows: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    with open(path, "w", encoding="utf-8", newline="") as outfile:
+        writer = csv.writer(outfile)
+        writer.writerow(["date", "title", "amount"])
+        for index in range(rows):
+            day = start + timedelta(days=index * 1500 // rows)
+            writer.writerow(
+                [
+                    day.isoformat(),
+                    f"Loja {rng.randint(1, 999)}",
+                    f"{rng.randint(1, 99999) / 100:.2f}",
+                ]
+            )
+
+
+def write_bradesco_pdf(path: str, pages: int, cards: int = 3, seed: int = 0) -> int:
+    """
+    Writes a multi-card Bradesco-like statement and returns how many
+    transaction rows it holds. Cards change evenly across the pages.
+    """
+    rng = random.Random(seed)
+    content = []
+    rows = 0
+    for page_number in range(pages):
+        lines = []
+        if page_number == 0:
+            lines += ["Data de Vencimento Total da Fatura R$", "VENCIMENTO 10/02/2025"]
+        if page_number * cards % pages < cards:
+            card = page_number * cards // pages
+            lines.append(f"JOHN DOE Cartão 4066 XXXX XXXX {1000 + card:04d}")
+        while len(lines) < _ROWS_PER_PAGE:
+            cents = rng.randint(1, 999999)
+            amount = f"{cents // 100:,}".replace(",", ".") + f",{cents % 100:02d}"
+            lines.append(
+                f"{rng.randint(1, 28):02d}/{rng.choice([12, 1]):02d} "
+                f"LOJA {rng.randint(1, 500)} SAO PAULO {amount}"
+            )
+            rows += 1
+        content.append(lines)
+
+    with open(path, "wb") as outfile:
+        outfile.write(build_pdf(content))
+    return rows
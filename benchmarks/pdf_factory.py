@@ -0,0 +1,71 @@
+"""
+Builds small text-only PDFs for the benchmarks and tests, so parsers can be
+exercised against real pdfplumber extraction without shipping statement
+samples.
+"""
+
+from typing import Sequence, Union
+
+Line = Union[str, Sequence[tuple[float, str]]]
+
+_PAGE_HEIGHT = 842
+_TOP_MARGIN = 800
+_LINE_HEIGHT = 14
+
+
+def build_pdf(pages: Sequence[Sequence[Line]]) -> bytes:
+    """
+    Returns a PDF with one page per entry, each line drawn top to bottom.
+    A line is either a string drawn at the left margin or a list of
+    ``(x, text)`` segments placed at those x coordinates.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+        b"/Encoding /WinAnsiEncoding >>",
+    ]
+    page_refs = []
+    for lines in pages:
+        commands = [b"BT /F1 10 Tf"]
+        for index, line in enumerate(lines):
+            y = _TOP_MARGIN - index * _LINE_HEIGHT
+            segments = [(40.0, line)] if isinstance(line, str) else line
+            for x, segment in segments:
+                text = _escape(segment.encode("cp1252"))
+                commands.append(b"1 0 0 1 %.2f %d Tm (%s) Tj" % (x, y, text))
+        commands.append(b"ET")
+        stream = b"\n".join(commands)
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 %d] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (_PAGE_HEIGHT, content_ref)
+        )
+        page_refs.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(page_refs),
+        len(page_refs),
+    )
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref_offset,
+    )
+    return bytes(output)
+
+
+def _escape(text: bytes) -> bytes:
+    return text.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
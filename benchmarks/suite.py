@@ -0,0 +1,210 @@
+"""
+Throughput, memory and import-time benchmarks for every parser, with stored
+baselines to catch regressions.
+
+Each case runs in a fresh interpreter, so the import time is cold and the peak
+RSS belongs to that parser alone. Throughput is the best of a few runs.
+
+Run with:
+    python -m benchmarks.suite            # print the results
+    python -m benchmarks.suite --check    # also compare with the baseline
+    python -m benchmarks.suite --update   # store the results as the baseline
+
+``--check`` exits with status 1 when a case's throughput drops, or its peak
+RSS grows, by more than ``--threshold`` relative to the baseline. Baselines
+are machine dependent; update them on the machine that runs the check. The
+committed baseline.json is only a local reference: on pull requests CI
+records a baseline from the base branch on its own runner (``--update
+--baseline <file>``) and checks the pull request against that.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from importlib import import_module
+from typing import Optional
+from benchmarks.generators import write_bank_csv, write_bradesco_pdf, write_card_csv
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    module: str
+    parser_class: str
+    unit: str
+    """What the throughput counts: "rows" or "pages"."""
+
+
+CASES = [
+    Case(
+        "nubank-bank",
+        "statement_ingestor.nubank_bank_parser",
+        "NubankBankParser",
+        "rows",
+    ),
+    Case(
+        "nubank-card",
+        "statement_ingestor.nubank_credit_card_parser",
+        "NubankCreditCardParser",
+        "rows",
+    ),
+    Case(
+        "bradesco-card",
+        "statement_ingestor.bradesco_credit_card_parser",
+        "BradescoCreditCardParser",
+        "pages",
+    ),
+]
+
+
+@dataclass
+class Result:
+    throughput: float
+    """Units per second, best of the runs."""
+    rows_per_second: float
+    peak_rss_kb: int
+    import_seconds: float
+
+
+def run_case(case: Case, path: str, size: int, repeat: int) -> Result:
+    """Measures one case; meant to run in a fresh interpreter."""
+    started = time.perf_counter()
+    module = import_module(case.module)
+    import_seconds = time.perf_counter() - started
+    parser = getattr(module, case.parser_class)()
+
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = sum(1 for _ in parser.iter_transactions(path))
+        best = min(best, time.perf_counter() - started)
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss //= 1024
+    return Result(
+        throughput=size / best,
+        rows_per_second=rows / best,
+        peak_rss_kb=peak_rss,
+        import_seconds=import_seconds,
+    )
+
+
+def measure(rows: int, pages: int, repeat: int) -> dict[str, Result]:
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        inputs = {
+            "nubank-bank": (os.path.join(directory, "bank.csv"), rows),
+            "nubank-card": (os.path.join(directory, "card.csv"), rows),
+            "bradesco-card": (os.path.join(directory, "bradesco.pdf"), pages),
+        }
+        write_bank_csv(inputs["nubank-bank"][0], rows)
+        write_card_csv(inputs["nubank-card"][0], rows)
+        write_bradesco_pdf(inputs["bradesco-card"][0], pages)
+
+        for case in CASES:
+            path, size = inputs[case.name]
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.suite",
+                    "--run-case",
+                    case.name,
+                    path,
+                    str(size),
+                    "--repeat",
+                    str(repeat),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            results[case.name] = Result(**json.loads(output))
+    return results
+
+
+def compare(
+    results: dict[str, Result], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """Returns a description of every regression beyond ``threshold``."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = Result(**baseline[name])
+        if result.throughput < expected.throughput * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {result.throughput:,.1f} is below "
+                f"baseline {expected.throughput:,.1f}"
+            )
+        if result.peak_rss_kb > expected.peak_rss_kb * (1 + threshold):
+            regressions.append(
+                f"{name}: peak RSS {result.peak_rss_kb:,} KB is above "
+                f"baseline {expected.peak_rss_kb:,} KB"
+            )
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    arguments = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    arguments.add_argument("--rows", type=int, default=200_000)
+    arguments.add_argument("--pages", type=int, default=20)
+    arguments.add_argument("--repeat", type=int, default=3)
+    arguments.add_argument("--check", action="store_true")
+    arguments.add_argument("--update", action="store_true")
+    arguments.add_argument("--threshold", type=float, default=0.2)
+    arguments.add_argument("--baseline", default=BASELINE_PATH)
+    arguments.add_argument(
+        "--run-case", nargs=3, metavar=("NAME", "PATH", "SIZE"), help=argparse.SUPPRESS
+    )
+    args = arguments.parse_args(argv)
+
+    if args.run_case:
+        name, path, size = args.run_case
+        case = next(case for case in CASES if case.name == name)
+        print(json.dumps(asdict(run_case(case, path, int(size), args.repeat))))
+        return 0
+
+    results = measure(args.rows, args.pages, args.repeat)
+    units = {case.name: case.unit for case in CASES}
+    for name, result in results.items():
+        print(
+            f"{name}: {result.throughput:,.1f} {units[name]}/s, "
+            f"{result.rows_per_second:,.0f} rows/s, "
+            f"peak RSS {result.peak_rss_kb / 1024:,.1f} MB, "
+            f"import {result.import_seconds * 1000:,.0f} ms"
+        )
+
+    if args.update:
+        with open(args.baseline, "w", encoding="utf-8") as outfile:
+            json.dump(
+                {name: asdict(result) for name, result in results.items()},
+                outfile,
+                indent=2,
+            )
+            outfile.write("\n")
+
+    if args.check:
+        with open(args.baseline, "r", encoding="utf-8") as infile:
+            baseline = json.load(infile)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
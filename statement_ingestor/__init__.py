@@ -2,14 +2,46 @@
 #
 # SPDX-License-Identifier: MIT
 
-from .base_parser import BaseParser
-from .nubank_credit_card_parser import NubankCreditCardParser
-from .nubank_bank_parser import NubankBankParser
-from .bradesco_credit_card_parser import BradescoCreditCardParser
-
-__all__ = [
-    "BaseParser",
-    "NubankCreditCardParser",
-    "NubankBankParser",
-    "BradescoCreditCardParser",
-]
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .base_parser import BaseParser
+    from .nubank_credit_card_parser import NubankCreditCardParser
+    from .nubank_bank_parser import NubankBankParser
+    from .bradesco_credit_card_parser import BradescoCreditCardParser
+    from .batch import IngestResult, ingest_many
+    from .cache import CachingParser, DiskCache
+    from .metrics import Metrics
+    from .registry import ingest, register, sniff
+
+# Names are resolved on first access, so that importing the package (or a
+# Nubank parser) does not pay for importing every parser and its dependencies.
+_EXPORTS = {
+    "BaseParser": ".base_parser",
+    "NubankCreditCardParser": ".nubank_credit_card_parser",
+    "NubankBankParser": ".nubank_bank_parser",
+    "BradescoCreditCardParser": ".bradesco_credit_card_parser",
+    "IngestResult": ".batch",
+    "ingest_many": ".batch",
+    "CachingParser": ".cache",
+    "DiskCache": ".cache",
+    "Metrics": ".metrics",
+    "ingest": ".registry",
+    "register": ".registry",
+    "sniff": ".registry",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,4 @@
+import sys
+from statement_ingestor.cli import main
+
+sys.exit(main())
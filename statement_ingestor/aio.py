@@ -0,0 +1,155 @@
+"""
+Asyncio front end for the parsers, for use inside event-loop based services.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+)
+from statement_ingestor.base_parser import BaseParser
+from statement_ingestor.batch import IngestResult
+from statement_ingestor.models import Statement, Transaction
+from statement_ingestor.sources import Source, is_path, open_binary
+
+
+class AsyncParser:
+    """
+    Runs a parser off the event loop.
+
+    At most ``max_concurrency`` sources are parsed at a time; further calls
+    wait for a slot, so a burst of uploads queues up instead of starting a
+    pdfplumber instance each. Whole-statement parses run on ``executor`` (the
+    loop's default thread pool when None; a ProcessPoolExecutor suits
+    CPU-bound PDF parsing), while ``aiter_transactions`` streams from a
+    thread.
+    """
+
+    def __init__(
+        self,
+        parser: BaseParser,
+        executor: Optional[Executor] = None,
+        max_concurrency: int = 4,
+    ):
+        self.parser = parser
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def aparse(self, source: Source) -> Statement:
+        loop = asyncio.get_running_loop()
+        async with self._slots:
+            if isinstance(self.executor, ProcessPoolExecutor) and not isinstance(
+                source, (str, os.PathLike, bytes)
+            ):
+                # File objects and views cannot be sent to another process.
+                source = await loop.run_in_executor(None, _read_all, source)
+            return await loop.run_in_executor(self.executor, self.parser.parse, source)
+
+    async def aiter_transactions(
+        self, source: Source, batch_size: int = 1000
+    ) -> AsyncIterator[Transaction]:
+        """Yields transactions as the worker thread reads them, in batches."""
+        loop = asyncio.get_running_loop()
+        async with self._slots:
+            # Parsers may do their extraction up front, before returning an
+            # iterator, so creating it must not happen on the loop either.
+            transactions = await loop.run_in_executor(
+                None, _open_transactions, self.parser, source
+            )
+            try:
+                while batch := await loop.run_in_executor(
+                    None, _next_batch, transactions, batch_size
+                ):
+                    for transaction in batch:
+                        yield transaction
+            finally:
+                await loop.run_in_executor(None, _close, transactions)
+
+    async def aparse_many(
+        self, sources: Union[Iterable[Source], AsyncIterable[Source]]
+    ) -> AsyncIterator[IngestResult]:
+        """
+        Parses sources as they finish, pulling the next source only when a
+        slot frees up. Failures are reported per source, as in ingest_many.
+        """
+        pending: set[asyncio.Task[IngestResult]] = set()
+        async for index, source in _aenumerate(sources):
+            if len(pending) >= self.max_concurrency:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+            pending.add(asyncio.create_task(self._timed_parse(index, source)))
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result()
+
+    async def _timed_parse(self, index: int, source: Source) -> IngestResult:
+        path = os.fspath(source) if is_path(source) else f"<source {index}>"
+        started = time.perf_counter()
+        try:
+            statement = await self.aparse(source)
+        except Exception as exc:
+            return IngestResult(
+                path=path,
+                statement=None,
+                error=f"{type(exc).__name__}: {exc}",
+                elapsed=time.perf_counter() - started,
+            )
+        return IngestResult(
+            path=path,
+            statement=statement,
+            error=None,
+            elapsed=time.perf_counter() - started,
+        )
+
+
+async def _aenumerate(
+    sources: Union[Iterable[Source], AsyncIterable[Source]],
+) -> AsyncIterator[tuple[int, Source]]:
+    index = 0
+    if isinstance(sources, AsyncIterable):
+        async for source in sources:
+            yield index, source
+            index += 1
+    else:
+        for source in sources:
+            yield index, source
+            index += 1
+
+
+def _read_all(source: Source) -> bytes:
+    with open_binary(source) as stream:
+        return stream.read()
+
+
+def _open_transactions(parser: BaseParser, source: Source) -> Iterator[Transaction]:
+    return iter(parser.iter_transactions(source))
+
+
+def _next_batch(transactions: Iterator[Transaction], size: int) -> list[Transaction]:
+    batch = []
+    for transaction in transactions:
+        batch.append(transaction)
+        if len(batch) == size:
+            break
+    return batch
+
+
+def _close(transactions: Iterator[Transaction]) -> None:
+    close = getattr(transactions, "close", None)
+    if close is not None:
+        close()
@@ -0,0 +1,216 @@
+"""
+Apache Arrow record batches and partitioned Parquet datasets of transactions.
+
+Requires the optional ``pyarrow`` dependency
+(``pip install statement-ingestor[arrow]``).
+
+Columns are typed for analytical engines: ``date`` is date32, ``amount_cents``
+is int64 and ``currency``, ``account_id`` and ``category`` are dictionary
+encoded. Batches are filled from flat ``array`` buffers handed to Arrow
+without copying, and a TransactionTable is converted by wrapping its NumPy
+columns, so no per-row Python objects are built on the way out.
+"""
+
+import sys
+import uuid
+from array import array
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Union
+
+try:
+    import pyarrow as pa  # type: ignore[import-untyped]
+    import pyarrow.compute as pc  # type: ignore[import-untyped]
+    import pyarrow.dataset as ds  # type: ignore[import-untyped]
+except ImportError as exc:  # no cov
+    raise ImportError(
+        "Arrow export requires pyarrow: pip install 'statement-ingestor[arrow]'"
+    ) from exc
+
+from statement_ingestor.models import (
+    EPOCH_ORDINAL,
+    DictionaryEncoder,
+    Statement,
+    Transaction,
+    to_cents,
+)
+
+if TYPE_CHECKING:
+    from statement_ingestor.columnar import Categorical, TransactionTable
+
+DEFAULT_BATCH_SIZE = 65_536
+
+_DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+
+SCHEMA = pa.schema(
+    [
+        pa.field("date", pa.date32(), nullable=False),
+        pa.field("description", pa.string(), nullable=False),
+        pa.field("amount_cents", pa.int64(), nullable=False),
+        pa.field("currency", _DICTIONARY, nullable=False),
+        pa.field("account_id", _DICTIONARY, nullable=False),
+        pa.field("category", _DICTIONARY),
+    ]
+)
+
+_PARTITIONING = ds.partitioning(
+    pa.schema([("account_id", pa.string()), ("month", pa.string())]),
+    flavor="hive",
+)
+
+Transactions = Union[Statement, "TransactionTable", Iterable[Transaction]]
+
+
+def record_batches(
+    transactions: Transactions, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[pa.RecordBatch]:
+    """
+    Yields ``SCHEMA`` record batches of at most ``batch_size`` rows, consuming
+    ``transactions`` lazily so a parser's iter_transactions can be streamed.
+    """
+    # A TransactionTable can only exist if the columnar module, and therefore
+    # numpy, was imported; checking sys.modules avoids importing it here.
+    columnar = sys.modules.get("statement_ingestor.columnar")
+    if columnar is not None and isinstance(transactions, columnar.TransactionTable):
+        for start in range(0, len(transactions), batch_size):
+            yield record_batch_from_table(transactions[start : start + batch_size])
+        return
+
+    if isinstance(transactions, Statement):
+        transactions = transactions.transactions
+    builder = _BatchBuilder()
+    for transaction in transactions:
+        builder.add(transaction)
+        if len(builder) == batch_size:
+            yield builder.build()
+            builder = _BatchBuilder()
+    if len(builder):
+        yield builder.build()
+
+
+def to_table(transactions: Transactions) -> pa.Table:
+    return pa.Table.from_batches(record_batches(transactions), schema=SCHEMA)
+
+
+def record_batch_from_table(table: "TransactionTable") -> pa.RecordBatch:
+    """
+    Wraps a TransactionTable's columns as a record batch. Amounts and
+    dictionary codes are shared with the NumPy arrays; dates are narrowed
+    from datetime64[D] to date32, which copies them.
+    """
+    return pa.record_batch(
+        [
+            pa.array(table.dates.astype("int32"), pa.int32()).view(pa.date32()),
+            _dictionary_from_categorical(table.descriptions).dictionary_decode(),
+            pa.array(table.amounts, pa.int64()),
+            _dictionary_from_categorical(table.currencies),
+            _dictionary_from_categorical(table.account_ids),
+            _dictionary_from_categorical(table.categories),
+        ],
+        schema=SCHEMA,
+    )
+
+
+def write_parquet_dataset(
+    transactions: Transactions,
+    root: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_rows_per_file: int = 0,
+) -> None:
+    """
+    Writes a Parquet dataset under ``root`` partitioned Hive-style by account
+    and month, as ``account_id=<id>/month=<YYYY-MM>/part-*.parquet``.
+
+    Batches are streamed to the writer, so memory stays bounded by
+    ``batch_size``, which also caps the rows per Parquet row group. Every
+    call adds new files, so the same root can be appended to statement by
+    statement; ``max_rows_per_file`` (0 for no limit) splits large partitions.
+    """
+    batches = (_with_month(batch) for batch in record_batches(transactions, batch_size))
+    ds.write_dataset(
+        batches,
+        root,
+        schema=SCHEMA.append(pa.field("month", pa.string(), nullable=False)),
+        format="parquet",
+        partitioning=_PARTITIONING,
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        max_rows_per_file=max_rows_per_file,
+        max_rows_per_group=batch_size,
+    )
+
+
+def read_parquet_dataset(root: str) -> pa.Table:
+    """Reads back a dataset written by ``write_parquet_dataset``."""
+    return ds.dataset(root, format="parquet", partitioning=_PARTITIONING).to_table()
+
+
+def _with_month(batch: pa.RecordBatch) -> pa.RecordBatch:
+    month = pc.strftime(batch.column("date"), format="%Y-%m")
+    return pa.record_batch(
+        [*batch.columns, month],
+        schema=batch.schema.append(pa.field("month", pa.string(), nullable=False)),
+    )
+
+
+def _dictionary_from_categorical(column: "Categorical") -> pa.DictionaryArray:
+    return _dictionary(pa.array(column.codes, pa.int32()), column.categories)
+
+
+def _dictionary(codes: pa.Array, values: list[Optional[str]]) -> pa.DictionaryArray:
+    """
+    Builds a dictionary array, turning the code of a None value into a null
+    index: Parquet cannot store nulls inside the dictionary itself.
+    """
+    if None in values:
+        none_code = values.index(None)
+        is_none = pc.equal(codes, none_code)
+        codes = pc.if_else(is_none, pa.scalar(None, pa.int32()), codes)
+        values = ["" if value is None else value for value in values]
+    return pa.DictionaryArray.from_arrays(codes, pa.array(values, pa.string()))
+
+
+class _BatchBuilder:
+    """Accumulates one batch of transactions into flat, Arrow-ready buffers."""
+
+    def __init__(self) -> None:
+        self._days = array("i")
+        self._amounts = array("q")
+        self._descriptions: list[str] = []
+        self._currencies = DictionaryEncoder()
+        self._account_ids = DictionaryEncoder()
+        self._categories = DictionaryEncoder()
+
+    def __len__(self) -> int:
+        return len(self._amounts)
+
+    def add(self, transaction: Transaction) -> None:
+        self._days.append(transaction.date.toordinal() - EPOCH_ORDINAL)
+        self._amounts.append(to_cents(transaction.amount))
+        self._descriptions.append(transaction.description)
+        self._currencies.add(transaction.currency)
+        self._account_ids.add(transaction.account_id)
+        self._categories.add(transaction.category)
+
+    def build(self) -> pa.RecordBatch:
+        length = len(self)
+        return pa.record_batch(
+            [
+                pa.Array.from_buffers(
+                    pa.date32(), length, [None, pa.py_buffer(self._days)]
+                ),
+                pa.array(self._descriptions, pa.string()),
+                pa.Array.from_buffers(
+                    pa.int64(), length, [None, pa.py_buffer(self._amounts)]
+                ),
+                _dictionary_from_encoder(self._currencies),
+                _dictionary_from_encoder(self._account_ids),
+                _dictionary_from_encoder(self._categories),
+            ],
+            schema=SCHEMA,
+        )
+
+
+def _dictionary_from_encoder(encoder: DictionaryEncoder) -> pa.DictionaryArray:
+    codes = pa.Array.from_buffers(
+        pa.int32(), len(encoder.codes), [None, pa.py_buffer(encoder.codes)]
+    )
+    return _dictionary(codes, encoder.values)
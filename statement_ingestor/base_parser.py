@@ -1,8 +1,95 @@
 from abc import ABC, abstractmethod
-from statement_ingestor.models import Statement
+from typing import TYPE_CHECKING, Iterator, Optional
+from statement_ingestor.metrics import NULL_METRICS, Metrics
+from statement_ingestor.models import (
+    AccountType,
+    CompactTransaction,
+    Statement,
+    StatementBuilder,
+    Transaction,
+)
+from statement_ingestor.sources import Source
+
+if TYPE_CHECKING:
+    from statement_ingestor.columnar import TransactionTable
 
 
 class BaseParser(ABC):
+    name: str
+    account_id: str
+    account_type: AccountType
+    metrics: Metrics = NULL_METRICS
+
+    def __init__(self, metrics: Optional[Metrics] = None):
+        """
+        :param metrics: collects stage timings and counters for every parse
+            made with this parser. Left out, nothing is recorded.
+        """
+        if metrics is not None:
+            self.metrics = metrics
+
+    @classmethod
+    def sniff(cls, source: Source, head: bytes) -> bool:
+        """
+        Tells whether the source looks like a statement this parser reads.
+        ``head`` holds its first few KB; implementations should decide from it,
+        or from other similarly cheap reads, without parsing the whole source.
+        """
+        return False
+
     @abstractmethod
-    def parse(self, file_path: str) -> Statement:
-        pass
+    def iter_transactions(self, source: Source) -> Iterator[Transaction]:
+        """
+        Yields the transactions of a statement as they are read, so callers
+        can process arbitrarily large statements without holding them in memory.
+        """
+
+    def cache_token(self) -> Optional[str]:
+        """
+        Describes the options that change this parser's output, for use in
+        cache keys. Parsers without such options return an empty string, and
+        parsers whose options cannot be described (such as arbitrary
+        callables) return None, so their results are never cached.
+        """
+        return ""
+
+    def parse(self, source: Source) -> Statement:
+        builder = StatementBuilder(self.account_id, self.account_type)
+        with self.metrics.stage("build"):
+            transactions = self._iter_statement(source, builder)
+            builder.extend(self._instrumented(transactions))
+            return builder.build()
+
+    def iter_compact_transactions(self, source: Source) -> Iterator[CompactTransaction]:
+        """Like iter_transactions, but yields slotted integer-cent transactions."""
+        for transaction in self._instrumented(self.iter_transactions(source)):
+            yield CompactTransaction.from_transaction(transaction)
+
+    def parse_table(self, source: Source) -> "TransactionTable":
+        """
+        Streams the transactions straight into a columnar TransactionTable.
+        Requires numpy.
+        """
+        from statement_ingestor.columnar import TransactionTable
+
+        with self.metrics.stage("build"):
+            transactions = self._instrumented(self.iter_transactions(source))
+            return TransactionTable.from_transactions(transactions)
+
+    def _iter_statement(
+        self, source: Source, builder: StatementBuilder
+    ) -> Iterator[Transaction]:
+        """
+        The transactions for ``parse``. Parsers that read statement-level
+        fields, such as a due date, override this to set them on ``builder``.
+        """
+        return self.iter_transactions(source)
+
+    def _instrumented(
+        self, transactions: Iterator[Transaction]
+    ) -> Iterator[Transaction]:
+        if not self.metrics.enabled:
+            return transactions
+        return self.metrics.counted(
+            "transactions", self.metrics.timed("parse", transactions)
+        )
@@ -0,0 +1,81 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Iterable, Iterator, Optional
+from statement_ingestor.base_parser import BaseParser
+from statement_ingestor.models import Statement
+from statement_ingestor.registry import ingest
+
+
+@dataclass
+class IngestResult:
+    path: str
+    statement: Statement | None
+    error: str | None
+    elapsed: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def ingest_many(
+    paths: Iterable[str],
+    parser: Optional[BaseParser] = None,
+    workers: Optional[int] = None,
+    ordered: bool = True,
+    chunksize: Optional[int] = None,
+) -> Iterator[IngestResult]:
+    """
+    Parses many statement files on a process pool.
+
+    Files are scheduled in chunks of ``chunksize`` paths to amortize the
+    inter-process overhead. Results are yielded in input order, or as soon as
+    each chunk finishes when ``ordered`` is False. A file that fails to parse
+    yields a result carrying the error instead of aborting the batch.
+    Without a ``parser``, each file is routed by sniffing its format.
+    """
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(paths) // (workers * 4))
+    chunks = [paths[i : i + chunksize] for i in range(0, len(paths), chunksize)]
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from _ingest_chunk(parser, chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if ordered:
+            for results in executor.map(_ingest_chunk, repeat(parser), chunks):
+                yield from results
+        else:
+            futures = [executor.submit(_ingest_chunk, parser, c) for c in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+
+
+def _ingest_chunk(parser: Optional[BaseParser], paths: list[str]) -> list[IngestResult]:
+    return [_ingest_one(parser, path) for path in paths]
+
+
+def _ingest_one(parser: Optional[BaseParser], path: str) -> IngestResult:
+    started = time.perf_counter()
+    try:
+        statement = parser.parse(path) if parser is not None else ingest(path)
+    except Exception as exc:
+        return IngestResult(
+            path=path,
+            statement=None,
+            error=f"{type(exc).__name__}: {exc}",
+            elapsed=time.perf_counter() - started,
+        )
+    return IngestResult(
+        path=path,
+        statement=statement,
+        error=None,
+        elapsed=time.perf_counter() - started,
+    )
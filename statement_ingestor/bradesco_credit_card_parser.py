@@ -1,116 +1,599 @@
-from typing import Optional
-import pdfplumber
+from dataclasses import dataclass, is_dataclass
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+)
+import os
 import re
+import zlib
+from contextlib import closing
 from datetime import datetime, date
 from decimal import Decimal
-from statement_ingestor.models import AccountType, Statement, Transaction
+from itertools import repeat
+from operator import itemgetter
+from types import FunctionType
+from statement_ingestor.installments import parse_installment
+from statement_ingestor.models import AccountType, StatementBuilder, Transaction
 from statement_ingestor.base_parser import BaseParser
-from collections import defaultdict
+from statement_ingestor.cache import DiskCache, file_digest
+from statement_ingestor.metrics import NULL_METRICS, Metrics
+from statement_ingestor.registry import register
+from statement_ingestor.sources import Source, is_path, open_binary
 
+# pdfplumber (and pdfminer) take a large share of the package's import time,
+# so they are only imported once a PDF is actually read.
+if TYPE_CHECKING:
+    from pdfplumber.page import Page
 
+_TRANSACTION_PATTERN = re.compile(
+    r"""(?P<date>\d{2}/\d{2})\s+
+    (?P<description>.*?)\s+
+    (?P<amount>[\d.,]+-?)(?=\s|$)""",
+    re.VERBOSE,
+)
+_CARD_HEADER_PATTERN = re.compile(r"Cartão\s+\d{4}\s+XXXX\s+XXXX\s+(\d{4})")
+_DUE_DATE_PATTERN = re.compile(r"\d{2}/\d{2}/\d{4}")
+_DAY_MONTH_PATTERN = re.compile(r"\d{2}/\d{2}")
+
+
+class PageAction(Enum):
+    PARSE = "parse"
+    SKIP = "skip"
+    LAST = "last"
+    """Parse this page, then stop reading the PDF."""
+    STOP = "stop"
+    """Stop reading the PDF without parsing this page."""
+
+
+PageRule = Callable[[int, list[str]], PageAction]
+"""Decides what to do with a page, given its zero-based number and lines."""
+
+
+def stop_after_marker(marker: str) -> PageRule:
+    """Stops reading after the first page with a line containing ``marker``."""
+    return _StopAfterMarker(marker)
+
+
+def stop_after_pages(count: int) -> PageRule:
+    """Reads at most ``count`` pages."""
+    return _StopAfterPages(count)
+
+
+def skip_pages_without_transactions(page_number: int, lines: list[str]) -> PageAction:
+    """
+    Skips pages with no ``dd/mm`` transaction line. Pages holding a card
+    header or the due date are kept, since they change how later lines parse.
+    """
+    for line in lines:
+        if _classify_line(line)[0] is not _LineKind.NOISE:
+            return PageAction.PARSE
+    return PageAction.SKIP
+
+
+# Rules are frozen dataclasses rather than closures so that their repr, which
+# ends up in cache keys, describes their arguments.
+@dataclass(frozen=True)
+class _StopAfterMarker:
+    marker: str
+
+    def __call__(self, page_number: int, lines: list[str]) -> PageAction:
+        if any(self.marker in line for line in lines):
+            return PageAction.LAST
+        return PageAction.PARSE
+
+
+@dataclass(frozen=True)
+class _StopAfterPages:
+    count: int
+
+    def __call__(self, page_number: int, lines: list[str]) -> PageAction:
+        return PageAction.PARSE if page_number < self.count else PageAction.STOP
+
+
+@dataclass(frozen=True)
+class ColumnLayout:
+    """
+    Where the transaction table sits on a statement page, in PDF points from
+    the top-left corner, for character-level extraction.
+
+    Rows starting with a ``dd/mm`` date left of ``description_x0`` are rebuilt
+    as "date description amount" from the characters in each column;
+    everything right of ``amount_x1`` (such as loyalty-program notes) is
+    dropped. Other rows are kept whole, so card headers and the due date
+    still parse. When set, ``table_bbox`` (x0, top, x1, bottom) crops each
+    page before its characters are read; it must include those header lines.
+    """
+
+    description_x0: float
+    amount_x0: float
+    amount_x1: float
+    table_bbox: Optional[tuple[float, float, float, float]] = None
+    y_tolerance: float = 3.0
+    """Characters whose tops differ by less than this are on the same row."""
+    x_tolerance: float = 1.5
+    """Gaps wider than this between characters are read as a space."""
+
+
+class _LineKind(Enum):
+    HEADER = "header"
+    TRANSACTION = "transaction"
+    DUE_DATE = "due_date"
+    NOISE = "noise"
+
+
+@register
 class BradescoCreditCardParser(BaseParser):
-    def parse(self, file_path: str) -> Statement:
-        lines = _extract_statement_lines(file_path)
-        due_date = _extract_due_date(lines)
-
-        transactions = []
-        current_card_number = "0000"  # Default card number
-
-        for line in lines:
-            if card_number := _extract_card_number(line):
-                current_card_number = card_number
-
-            if _is_transaction_line(line):
-                account_id = f"bradesco_credit_card_{current_card_number}"
-                transaction = _parse_transaction(line, account_id, due_date)
-                if transaction:
-                    transactions.append(transaction)
-
-        if not transactions:
-            return Statement(
-                account_id="bradesco_credit_card_multi",
-                account_type=AccountType.CREDIT_CARD,
-                transactions=[],
-                start_date=None,
-                end_date=None,
-            )
+    name = "bradesco-card"
+    account_id = "bradesco_credit_card_multi"
+    account_type = AccountType.CREDIT_CARD
+
+    def __init__(
+        self,
+        workers: int = 1,
+        line_cache: Optional[DiskCache] = None,
+        page_rules: Sequence["PageRule"] = (),
+        column_layout: Optional["ColumnLayout"] = None,
+        metrics: Optional[Metrics] = None,
+        skip_invalid: bool = False,
+    ):
+        """
+        :param workers: number of processes used to extract the PDF text. Pages
+            are split into contiguous ranges, one process per range, and the
+            lines are merged back in page order before parsing.
+        :param line_cache: stores the extracted text lines of each PDF, keyed by
+            file content and pdfplumber version, so that changes to the parsing
+            rules do not pay for the layout analysis again.
+        :param page_rules: called in order with each extracted page to decide
+            whether to parse it, skip it or stop reading the PDF; see
+            ``PageAction``. With a single worker pages are extracted one at
+            a time, so stopping early skips the extraction of the remaining
+            pages. With ``workers > 1`` every page is extracted up front and
+            the rules only decide which pages are parsed.
+        :param column_layout: switches extraction from pdfplumber's whole-page
+            text reflow to bucketing each page's characters into rows and
+            columns; see ``ColumnLayout``.
+        :param metrics: see ``BaseParser``. Records the "open", "extract" and
+            "parse" stages and counts pages, rows (text lines) and, with
+            ``skip_invalid``, rejected lines.
+        :param skip_invalid: skip lines that look like transactions but hold
+            an invalid date or amount, instead of raising ValueError. Skipped
+            lines are counted as "rejected_lines".
+        """
+        super().__init__(metrics)
+        self.workers = workers
+        self.line_cache = line_cache
+        self.page_rules = page_rules
+        self.column_layout = column_layout
+        self.skip_invalid = skip_invalid
+
+    @classmethod
+    def sniff(cls, source: Source, head: bytes) -> bool:
+        """PDF magic bytes and a card header on the first page."""
+        if not head.startswith(b"%PDF-"):
+            return False
+        import pdfplumber
+
+        with open_binary(source) as stream:
+            position = stream.tell()
+            try:
+                with pdfplumber.open(stream) as pdf:  # type: ignore[arg-type]
+                    first_page = pdf.pages[0].extract_text() if pdf.pages else ""
+            finally:
+                stream.seek(position)
+        return "Cartão" in (first_page or "")
+
+    def iter_transactions(self, source: Source) -> Iterator[Transaction]:
+        return _parse_lines(
+            self._statement_lines(source), self.metrics, skip_invalid=self.skip_invalid
+        )
+
+    def _iter_statement(
+        self, source: Source, builder: StatementBuilder
+    ) -> Iterator[Transaction]:
+        def set_due_date(due_date: date) -> None:
+            builder.due_date = due_date
 
-        start_date = min(t.date for t in transactions)
-        end_date = max(t.date for t in transactions)
+        lines = self._statement_lines(source)
+        return _parse_lines(
+            lines, self.metrics, set_due_date, skip_invalid=self.skip_invalid
+        )
 
-        return Statement(
-            account_id="bradesco_credit_card_multi",
-            account_type=AccountType.CREDIT_CARD,
-            transactions=transactions,
-            start_date=start_date,
-            end_date=end_date,
+    def _statement_lines(self, source: Source) -> Generator[str, None, None]:
+        return _extract_statement_lines(
+            source,
+            self.workers,
+            self.line_cache,
+            self.page_rules,
+            self.column_layout,
+            self.metrics,
         )
 
+    def cache_token(self) -> Optional[str]:
+        rule_tokens = [_rule_token(rule) for rule in self.page_rules]
+        if None in rule_tokens:
+            return None
+        return repr((self.column_layout, rule_tokens, self.skip_invalid))
+
+    def extract_due_date(self, source: Source) -> Optional[date]:
+        """
+        Reads the due date alone. Pages are extracted only until it is found,
+        which is normally on the first one.
+        """
+        lines = _extract_statement_lines(
+            source, 1, self.line_cache, column_layout=self.column_layout
+        )
+        with closing(lines):
+            return _extract_due_date(lines)
+
+
+def _parse_lines(
+    lines: Iterable[str],
+    metrics: Metrics = NULL_METRICS,
+    on_due_date: Optional[Callable[[date], None]] = None,
+    skip_invalid: bool = False,
+) -> Iterator[Transaction]:
+    """
+    Classifies every line once and builds transactions from the same match.
+
+    Transaction years depend on the due date, so transactions seen before the
+    due date line are held back until it is found (or the lines run out).
+    Lines shaped like transactions whose date or amount is invalid raise
+    ValueError, or with ``skip_invalid`` are skipped and counted as
+    "rejected_lines". ``on_due_date`` is called with
+    the due date once it is found.
+    """
+    current_card_number = "0000"  # Default card number
+    due_date: Optional[date] = None
+    pending: Optional[list[tuple[re.Match[str], str]]] = []
+
+    for line in lines:
+        kind, match = _classify_line(line)
+        if match is None:
+            continue
+
+        if kind is _LineKind.TRANSACTION:
+            account_id = f"bradesco_credit_card_{current_card_number}"
+            if pending is not None:
+                pending.append((match, account_id))
+            elif transaction := _accept(
+                match, account_id, due_date, metrics, skip_invalid
+            ):
+                yield transaction
+        elif kind is _LineKind.HEADER:
+            current_card_number = match.group(1)
+        elif kind is _LineKind.DUE_DATE and pending is not None:
+            due_date = datetime.strptime(match.group(0), "%d/%m/%Y").date()
+            if on_due_date is not None:
+                on_due_date(due_date)
+            for pending_match, account_id in pending:
+                if transaction := _accept(
+                    pending_match, account_id, due_date, metrics, skip_invalid
+                ):
+                    yield transaction
+            pending = None
+
+    for pending_match, account_id in pending or []:
+        if transaction := _accept(
+            pending_match, account_id, due_date, metrics, skip_invalid
+        ):
+            yield transaction
+
+
+def _accept(
+    match: re.Match[str],
+    account_id: str,
+    due_date: Optional[date],
+    metrics: Metrics,
+    skip_invalid: bool,
+) -> Optional[Transaction]:
+    try:
+        return _transaction_from_match(match, account_id, due_date)
+    except (ValueError, ArithmeticError) as exc:
+        if not skip_invalid:
+            raise ValueError(f"Invalid transaction line: {match.group(0)!r}") from exc
+        metrics.count("rejected_lines")
+        return None
+
+
+def _classify_line(line: str) -> tuple[_LineKind, Optional[re.Match[str]]]:
+    """
+    Tags a line as a transaction, card header, due date or noise, returning the
+    match that holds its fields. Substring checks guard the searching patterns
+    so most lines cost a single anchored match.
+    """
+    if match := _TRANSACTION_PATTERN.match(line):
+        return _LineKind.TRANSACTION, match
+    if "Cartão" in line and (match := _CARD_HEADER_PATTERN.search(line)):
+        return _LineKind.HEADER, match
+    if "VENCIMENTO" in line.upper() and (match := _DUE_DATE_PATTERN.search(line)):
+        return _LineKind.DUE_DATE, match
+    return _LineKind.NOISE, None
+
 
 def _parse_transaction(
     line: str, account_id: str, due_date: Optional[date]
 ) -> Transaction | None:
-    match = re.match(
-        r"""(?P<date>\d{2}/\d{2})\s+
-        (?P<description>.*?)\s+
-        (?P<amount>[\d.,]+-?)""",
-        line,
-        re.VERBOSE,
-    )
+    match = _TRANSACTION_PATTERN.match(line)
     if not match:
         return None
+    return _transaction_from_match(match, account_id, due_date)
+
 
+def _transaction_from_match(
+    match: re.Match[str], account_id: str, due_date: Optional[date]
+) -> Transaction:
     date_str = match.group("date")
     description = match.group("description")
     amount_str = match.group("amount")
 
-    is_negative = amount_str.endswith("-")
-    if is_negative:
-        amount_str = "-" + amount_str[:-1]
-
+    transaction_day = int(date_str[:2])
+    transaction_month = int(date_str[3:])
     transaction_year = datetime.now().year
     if due_date:
-        transaction_month = int(date_str.split("/")[1])
         if transaction_month > due_date.month:
             transaction_year = due_date.year - 1
         else:
             transaction_year = due_date.year
 
-    transaction_date = datetime.strptime(
-        f"{date_str}/{transaction_year}", "%d/%m/%Y"
-    ).date()
-    amount = float(Decimal(amount_str.replace(".", "").replace(",", ".")))
-
+    transaction_date = date(transaction_year, transaction_month, transaction_day)
+    installment = parse_installment(description)
     return Transaction(
         date=transaction_date,
         description=description,
-        amount=amount,
+        amount=_parse_amount_cents(amount_str) / 100,
         currency="BRL",
         account_id=account_id,
+        metadata=(
+            {"installment": installment[1], "installments": installment[2]}
+            if installment
+            else None
+        ),
     )
 
 
-def _extract_due_date(lines: list[str]) -> Optional[date]:
+def _parse_amount_cents(amount_str: str) -> int:
+    """
+    Converts a Brazilian-formatted amount to integer cents.
+    Example:
+    - "8.804,23-" -> -880423
+    """
+    is_negative = amount_str.endswith("-")
+    if is_negative:
+        amount_str = amount_str[:-1]
+
+    digits = amount_str.replace(".", "")
+    whole, _, fraction = digits.partition(",")
+    if len(fraction) == 2 and "," not in fraction:
+        cents = int(whole + fraction)
+    else:
+        cents = round(Decimal(digits.replace(",", ".")) * 100)
+    return -cents if is_negative else cents
+
+
+def _extract_due_date(lines: Iterable[str]) -> Optional[date]:
     """
     Extracts the statement due date from the statement lines.
     It looks for a line containing "VENCIMENTO" and a date in dd/mm/yyyy format.
     """
     for line in lines:
         if "VENCIMENTO" in line.upper():
-            match = re.search(r"(\d{2}/\d{2}/\d{4})", line)
+            match = _DUE_DATE_PATTERN.search(line)
             if match:
-                return datetime.strptime(match.group(1), "%d/%m/%Y").date()
+                return datetime.strptime(match.group(0), "%d/%m/%Y").date()
     return None
 
 
-def _extract_statement_lines(file_path: str) -> list[str]:
+def _extract_statement_lines(
+    source: Source,
+    workers: int = 1,
+    line_cache: Optional[DiskCache] = None,
+    page_rules: Sequence[PageRule] = (),
+    column_layout: Optional[ColumnLayout] = None,
+    metrics: Metrics = NULL_METRICS,
+) -> Generator[str, None, None]:
+    """Yields the statement's lines page by page, as each page is extracted."""
+    pages = _extract_pages(source, workers, line_cache, column_layout, metrics)
+    with closing(pages):
+        for page_number, lines in enumerate(pages):
+            metrics.count("pages")
+            action = PageAction.PARSE
+            for rule in page_rules:
+                action = rule(page_number, lines)
+                if action is not PageAction.PARSE:
+                    break
+
+            if action is PageAction.STOP:
+                return
+            if action is not PageAction.SKIP:
+                metrics.count("rows", len(lines))
+                yield from lines
+            if action is PageAction.LAST:
+                return
+
+
+def _extract_pages(
+    source: Source,
+    workers: int,
+    line_cache: Optional[DiskCache],
+    column_layout: Optional[ColumnLayout],
+    metrics: Metrics = NULL_METRICS,
+) -> Generator[list[str], None, None]:
+    if line_cache is None:
+        yield from _iter_pages(source, workers, column_layout, metrics)
+        return
+
+    import pdfplumber
+
+    key = ":".join(
+        [
+            "pdf-pages",
+            pdfplumber.__version__,
+            repr(column_layout),
+            file_digest(source),
+        ]
+    )
+    cached = line_cache.get(key)
+    if cached is not None:
+        text = zlib.decompress(cached).decode("utf-8")
+        for page in text.split("\f") if text else []:
+            yield page.split("\n")
+        return
+
+    pages = []
+    for lines in _iter_pages(source, workers, column_layout, metrics):
+        pages.append("\n".join(lines))
+        yield lines
+    # Only reached when every page was read, so partial reads are not cached.
+    line_cache.put(key, zlib.compress("\f".join(pages).encode("utf-8")))
+
+
+def _iter_pages(
+    source: Source,
+    workers: int,
+    column_layout: Optional[ColumnLayout] = None,
+    metrics: Metrics = NULL_METRICS,
+) -> Iterator[list[str]]:
+    import pdfplumber
+
+    # Workers reopen the PDF themselves, which needs a path; in-memory sources
+    # are extracted in this process rather than copied to every worker.
+    if workers > 1 and is_path(source):
+        file_path = os.fspath(source)
+        with metrics.stage("open"), pdfplumber.open(file_path) as pdf:
+            page_count = len(pdf.pages)
+        if page_count > 1:
+            with metrics.stage("extract"):
+                pages = _extract_pages_parallel(
+                    file_path, page_count, workers, column_layout
+                )
+            yield from pages
+            return
+
+    with open_binary(source) as stream:
+        with metrics.stage("open"):
+            pdf = pdfplumber.open(stream)  # type: ignore[arg-type]
+            pdf_pages = pdf.pages
+        with pdf:
+            for page in pdf_pages:
+                with metrics.stage("extract"):
+                    lines = _page_lines(page, column_layout)
+                    page.close()
+                yield lines
+
+
+def _extract_pages_parallel(
+    file_path: str,
+    page_count: int,
+    workers: int,
+    column_layout: Optional[ColumnLayout],
+) -> list[list[str]]:
+    """
+    Extracts contiguous page ranges in separate processes, each opening the PDF
+    itself, and concatenates the results in page order.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(workers, page_count)
+    bounds = [page_count * i // workers for i in range(workers + 1)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(
+            _extract_page_range,
+            repeat(file_path),
+            bounds[:-1],
+            bounds[1:],
+            repeat(column_layout),
+        )
+        return [page for chunk in chunks for page in chunk]
+
+
+def _extract_page_range(
+    file_path: str, start: int, stop: int, column_layout: Optional[ColumnLayout]
+) -> list[list[str]]:
+    import pdfplumber
+
     with pdfplumber.open(file_path) as pdf:
-        result = []
+        return [_page_lines(page, column_layout) for page in pdf.pages[start:stop]]
+
 
-        for page in pdf.pages:
-            result.extend(page.extract_text().split("\n"))
+def _page_lines(page: "Page", column_layout: Optional[ColumnLayout]) -> list[str]:
+    if column_layout is None:
+        return page.extract_text().split("\n")
+    return _page_lines_from_chars(page, column_layout)
 
-        return result
+
+def _page_lines_from_chars(page: "Page", layout: ColumnLayout) -> list[str]:
+    """
+    Rebuilds a page's lines from its characters: rows are formed by bucketing
+    character tops, and transaction rows are split into date, description
+    and amount columns by x coordinate.
+    """
+    if layout.table_bbox is not None:
+        page = page.crop(layout.table_bbox)
+
+    rows: list[tuple[float, list[dict]]] = []
+    for char in sorted(page.chars, key=itemgetter("top")):
+        if rows and char["top"] - rows[-1][0] < layout.y_tolerance:
+            rows[-1][1].append(char)
+        else:
+            rows.append((char["top"], [char]))
+
+    lines = []
+    for _, row in rows:
+        row.sort(key=itemgetter("x0"))
+        date_chars = [c for c in row if c["x0"] < layout.description_x0]
+        date_text = _join_chars(date_chars, layout.x_tolerance)
+        if _DAY_MONTH_PATTERN.fullmatch(date_text):
+            description = _join_chars(
+                [c for c in row if layout.description_x0 <= c["x0"] < layout.amount_x0],
+                layout.x_tolerance,
+            )
+            amount = _join_chars(
+                [c for c in row if layout.amount_x0 <= c["x0"] < layout.amount_x1],
+                layout.x_tolerance,
+            )
+            lines.append(f"{date_text} {description} {amount}")
+        else:
+            lines.append(_join_chars(row, layout.x_tolerance))
+    return lines
+
+
+def _join_chars(chars: list[dict], x_tolerance: float) -> str:
+    """Joins characters sorted by x, reading wide gaps as spaces."""
+    parts = []
+    previous_x1 = None
+    for char in chars:
+        if previous_x1 is not None and char["x0"] - previous_x1 > x_tolerance:
+            parts.append(" ")
+        parts.append(char["text"])
+        previous_x1 = char["x1"]
+    return " ".join("".join(parts).split())
+
+
+def _rule_token(rule: PageRule) -> Optional[str]:
+    """
+    Names a page rule for cache keys, or returns None when the name would not
+    tell it apart from other rules. Dataclass instances are described by
+    their repr; plain functions by their qualified name, unless they are
+    lambdas or nested functions, or carry state in closures or defaults.
+    """
+    if is_dataclass(rule):
+        return repr(rule)
+    if (
+        isinstance(rule, FunctionType)
+        and "<" not in rule.__qualname__
+        and rule.__closure__ is None
+        and not rule.__defaults__
+        and not rule.__kwdefaults__
+    ):
+        return f"{rule.__module__}.{rule.__qualname__}"
+    return None
 
 
 def _is_transaction_line(line: str) -> bool:
@@ -121,8 +604,7 @@ def _is_transaction_line(line: str) -> bool:
     - "06/03 PAO DE ACUCAR-1783 R. DE JANEIRO 24,05"
     - "27/02 POSTO CARDEAL RIO DE JANEIR 117,50 * Pontuação consolidada de todos os cartões do Associado."
     """
-    pattern = r"^\d{2}/\d{2}\s+.*?\s+[\d.,]+-?"
-    return bool(re.match(pattern, line))
+    return bool(_TRANSACTION_PATTERN.match(line))
 
 
 def _extract_card_number(line: str) -> Optional[str]:
@@ -131,8 +613,7 @@ def _extract_card_number(line: str) -> Optional[str]:
     Example:
     - "JOHN DOE Cartão 4066 XXXX XXXX 3029" -> "3029"
     """
-    pattern = r".*Cartão\s+\d{4}\s+XXXX\s+XXXX\s+(\d{4})"
-    match = re.search(pattern, line)
+    match = _CARD_HEADER_PATTERN.search(line)
     if match:
         return match.group(1)
     return None
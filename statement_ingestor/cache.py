@@ -0,0 +1,166 @@
+import hashlib
+import mmap
+import pickle
+import sqlite3
+import time
+import zlib
+from typing import Iterator, Optional
+from statement_ingestor.__about__ import __version__
+from statement_ingestor.base_parser import BaseParser
+from statement_ingestor.models import Statement, Transaction
+from statement_ingestor.sources import Source, open_binary
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Part of every statement cache key. Bump it whenever a parser starts
+# producing different statements from the same input, so entries cached by
+# earlier code are not served; the package version alone is not bumped often
+# enough to rely on. 2: Bradesco amounts after an n/N suffix, installment
+# metadata and Statement.due_date.
+STATEMENT_FORMAT = 2
+
+
+class DiskCache:
+    """
+    A size-bounded key/value store kept in a single SQLite file.
+
+    When the stored values exceed ``max_bytes``, the least recently used
+    entries are evicted. ``hits`` and ``misses`` count lookups made through
+    this instance.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._db: Optional[sqlite3.Connection] = None
+
+    def __getstate__(self) -> dict:
+        # Connections cannot cross process boundaries; workers reopen the file.
+        state = self.__dict__.copy()
+        state["_db"] = None
+        return state
+
+    def get(self, key: str) -> Optional[bytes]:
+        db = self._connection()
+        row = db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        with db:
+            db.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?",
+                (time.time_ns(), key),
+            )
+        return row[0]
+
+    def put(self, key: str, value: bytes) -> None:
+        db = self._connection()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time_ns()),
+            )
+            self._evict(db)
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        (total,) = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        oldest = db.execute("SELECT key, size FROM entries ORDER BY accessed")
+        evicted = []
+        for key, size in oldest:
+            evicted.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        db.executemany("DELETE FROM entries WHERE key = ?", evicted)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, accessed INTEGER NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+        return self._db
+
+
+class CachingParser(BaseParser):
+    """
+    Wraps a parser so that statements are served from a DiskCache when the
+    same content was already parsed by the same parser, with the same
+    options, package version and statement format. Parsers whose
+    ``cache_token`` is None are always run.
+    """
+
+    def __init__(self, parser: BaseParser, cache: DiskCache):
+        self.parser = parser
+        self.cache = cache
+        self.account_id = parser.account_id
+        self.account_type = parser.account_type
+
+    def iter_transactions(self, source: Source) -> Iterator[Transaction]:
+        return iter(self.parse(source).transactions)
+
+    def parse(self, source: Source) -> Statement:
+        key = self.cache_key(source)
+        if key is None:
+            return self.parser.parse(source)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return pickle.loads(zlib.decompress(cached))
+
+        statement = self.parser.parse(source)
+        payload = pickle.dumps(statement, protocol=pickle.HIGHEST_PROTOCOL)
+        self.cache.put(key, zlib.compress(payload))
+        return statement
+
+    def cache_key(self, source: Source) -> Optional[str]:
+        token = self.parser.cache_token()
+        if token is None:
+            return None
+        parser_class = type(self.parser)
+        return ":".join(
+            [
+                "statement",
+                f"v{STATEMENT_FORMAT}",
+                f"{parser_class.__module__}.{parser_class.__qualname__}",
+                __version__,
+                token,
+                file_digest(source),
+            ]
+        )
+
+
+def file_digest(source: Source) -> str:
+    """
+    Returns the SHA-256 of the source's content. Buffers are hashed in place
+    and file objects are rewound to where they were.
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        digest.update(source)
+        return digest.hexdigest()
+
+    with open_binary(source) as infile:
+        position = infile.tell()
+        while chunk := infile.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        infile.seek(position)
+    return digest.hexdigest()
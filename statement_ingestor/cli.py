@@ -0,0 +1,178 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, Sequence
+from statement_ingestor.registry import parser_for_name, registered_parsers, sniff
+
+if TYPE_CHECKING:
+    from statement_ingestor.base_parser import BaseParser
+    from statement_ingestor.models import Transaction
+
+_CSV_HEADER = [
+    "source",
+    "date",
+    "description",
+    "amount",
+    "currency",
+    "account_id",
+    "category",
+]
+
+
+def _batch(args: argparse.Namespace) -> int:
+    from statement_ingestor.batch import ingest_many
+
+    failures = 0
+    results = ingest_many(
+        _expand(args.paths),
+        parser_for_name(args.parser)() if args.parser else None,
+        workers=args.workers,
+        ordered=not args.unordered,
+        chunksize=args.chunksize,
+    )
+    for result in results:
+        if result.statement is not None:
+            status = f"{len(result.statement.transactions)} transactions"
+        else:
+            failures += 1
+            status = f"error: {result.error}"
+        print(f"{result.path}\t{result.elapsed:.3f}s\t{status}", flush=True)
+    return 1 if failures else 0
+
+
+def _parse(args: argparse.Namespace) -> int:
+    write = _ndjson_writer() if args.format == "ndjson" else _csv_writer()
+    parser = parser_for_name(args.parser)() if args.parser else None
+    failures = 0
+    for path in _expand(args.paths):
+        try:
+            for transaction in _iter_transactions(path, parser):
+                write(path, transaction)
+        except BrokenPipeError:
+            raise
+        except Exception as error:
+            # One bad file, or a forced parser that does not fit it, must
+            # not stop the remaining paths from being streamed.
+            failures += 1
+            print(f"{path}: {type(error).__name__}: {error}", file=sys.stderr)
+        sys.stdout.flush()
+    return 1 if failures else 0
+
+
+def _iter_transactions(
+    path: str, parser: Optional["BaseParser"]
+) -> Iterator["Transaction"]:
+    if parser is None:
+        parser_class = sniff(path)
+        if parser_class is None:
+            raise ValueError("Unrecognized statement format")
+        parser = parser_class()
+    return parser.iter_transactions(path)
+
+
+def _ndjson_writer() -> Callable[[str, "Transaction"], None]:
+    write = sys.stdout.write
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+
+    def write_transaction(path: str, transaction: "Transaction") -> None:
+        record = {
+            "source": path,
+            "date": transaction.date.isoformat(),
+            "description": transaction.description,
+            "amount": transaction.amount,
+            "currency": transaction.currency,
+            "account_id": transaction.account_id,
+        }
+        if transaction.category is not None:
+            record["category"] = transaction.category
+        if transaction.metadata:
+            record["metadata"] = transaction.metadata
+        write(dumps(record) + "\n")
+
+    return write_transaction
+
+
+def _csv_writer() -> Callable[[str, "Transaction"], None]:
+    writer = csv.writer(sys.stdout, lineterminator="\n")
+    writer.writerow(_CSV_HEADER)
+
+    def write_transaction(path: str, transaction: "Transaction") -> None:
+        writer.writerow(
+            (
+                path,
+                transaction.date.isoformat(),
+                transaction.description,
+                transaction.amount,
+                transaction.currency,
+                transaction.account_id,
+                transaction.category or "",
+            )
+        )
+
+    return write_transaction
+
+
+def _expand(patterns: Sequence[str]) -> list[str]:
+    """
+    Expands glob patterns (``**`` included) in sorted order. Arguments without
+    glob characters, or matching nothing, are kept as given so that missing
+    files are reported rather than silently skipped.
+    """
+    paths: list[str] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True))
+        if any(char in pattern for char in "*?[") and matches:
+            paths.extend(path for path in matches if not os.path.isdir(path))
+        else:
+            paths.append(pattern)
+    return paths
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="statement-ingestor")
+    commands = parser.add_subparsers(dest="command", required=True)
+    parser_names = [parser_class.name for parser_class in registered_parsers()]
+
+    parse = commands.add_parser(
+        "parse", help="stream the transactions of statements to stdout"
+    )
+    parse.add_argument(
+        "--parser",
+        choices=parser_names,
+        help="parser to use for every file (default: detect each file's format)",
+    )
+    parse.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parse.add_argument("paths", nargs="+", help="files or glob patterns")
+    parse.set_defaults(handler=_parse)
+
+    batch = commands.add_parser("batch", help="parse many statements in parallel")
+    batch.add_argument(
+        "--parser",
+        choices=parser_names,
+        help="parser to use for every file (default: detect each file's format)",
+    )
+    batch.add_argument("--workers", type=int, default=None)
+    batch.add_argument("--chunksize", type=int, default=None)
+    batch.add_argument(
+        "--unordered",
+        action="store_true",
+        help="report files as they finish instead of in input order",
+    )
+    batch.add_argument("paths", nargs="+", help="files or glob patterns")
+    batch.set_defaults(handler=_batch)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into ``head``); stop quietly and
+        # keep the interpreter from failing again while flushing stdout.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
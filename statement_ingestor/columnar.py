@@ -0,0 +1,206 @@
+"""
+A columnar, NumPy-backed container for large numbers of transactions.
+
+Requires the optional ``numpy`` dependency
+(``pip install statement-ingestor[columnar]``).
+"""
+
+from array import array
+from datetime import date
+from typing import Iterable, Iterator, Optional, overload
+
+try:
+    import numpy as np
+except ImportError as exc:  # no cov
+    raise ImportError(
+        "TransactionTable requires numpy: pip install 'statement-ingestor[columnar]'"
+    ) from exc
+
+from statement_ingestor.models import (
+    EPOCH_ORDINAL,
+    DictionaryEncoder,
+    Transaction,
+    to_cents,
+)
+
+
+class Categorical:
+    """A dictionary-encoded column: integer codes indexing a list of values."""
+
+    def __init__(self, codes: np.ndarray, categories: list[Optional[str]]):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        return self.categories[self.codes[index]]
+
+    def take(self, selector) -> "Categorical":
+        return Categorical(self.codes[selector], self.categories)
+
+    def equals(self, value: Optional[str]) -> np.ndarray:
+        """Returns a boolean mask of the rows holding ``value``."""
+        try:
+            code = self.categories.index(value)
+        except ValueError:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+
+class TransactionTable:
+    """
+    Transactions stored column by column.
+
+    Dates are ``datetime64[D]``, amounts are int64 cents and the string
+    columns are dictionary encoded. Slicing returns views over the same
+    arrays; ``filter`` and the aggregations run vectorized, and rows are only
+    turned back into Transaction objects on access.
+    """
+
+    def __init__(
+        self,
+        dates: np.ndarray,
+        amounts: np.ndarray,
+        descriptions: Categorical,
+        currencies: Categorical,
+        account_ids: Categorical,
+        categories: Categorical,
+    ):
+        self.dates = dates
+        self.amounts = amounts
+        self.descriptions = descriptions
+        self.currencies = currencies
+        self.account_ids = account_ids
+        self.categories = categories
+
+    @classmethod
+    def from_transactions(
+        cls, transactions: Iterable[Transaction]
+    ) -> "TransactionTable":
+        builder = TransactionTableBuilder()
+        builder.extend(transactions)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    @overload
+    def __getitem__(self, index: int) -> Transaction: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "TransactionTable": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._take(index)
+        return Transaction(
+            date=self.dates[index].item(),
+            description=self.descriptions[index],
+            amount=int(self.amounts[index]) / 100,
+            currency=self.currencies[index],
+            account_id=self.account_ids[index],
+            category=self.categories[index],
+        )
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return self.to_transactions()
+
+    def to_transactions(self) -> Iterator[Transaction]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def filter(self, mask: np.ndarray) -> "TransactionTable":
+        return self._take(mask)
+
+    def account_mask(self, account_id: str) -> np.ndarray:
+        return self.account_ids.equals(account_id)
+
+    def date_mask(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> np.ndarray:
+        """Returns a mask of the rows dated within ``start`` and ``end``, inclusive."""
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.dates >= np.datetime64(start, "D")
+        if end is not None:
+            mask &= self.dates <= np.datetime64(end, "D")
+        return mask
+
+    def total(self) -> int:
+        return int(self.amounts.sum())
+
+    def sum_by_account(self) -> dict[str, int]:
+        """Returns the total in cents of each account."""
+        totals = np.zeros(len(self.account_ids.categories), dtype=np.int64)
+        np.add.at(totals, self.account_ids.codes, self.amounts)
+        present = np.bincount(
+            self.account_ids.codes, minlength=len(self.account_ids.categories)
+        )
+        return {
+            str(account_id): int(total)
+            for account_id, total, count in zip(
+                self.account_ids.categories, totals, present
+            )
+            if count
+        }
+
+    def sum_by_month(self) -> dict[str, int]:
+        """Returns the total in cents of each month, keyed by ``YYYY-MM``."""
+        months, codes = np.unique(
+            self.dates.astype("datetime64[M]"), return_inverse=True
+        )
+        totals = np.zeros(len(months), dtype=np.int64)
+        np.add.at(totals, codes.ravel(), self.amounts)
+        return {str(month): int(total) for month, total in zip(months, totals)}
+
+    def _take(self, selector) -> "TransactionTable":
+        return TransactionTable(
+            dates=self.dates[selector],
+            amounts=self.amounts[selector],
+            descriptions=self.descriptions.take(selector),
+            currencies=self.currencies.take(selector),
+            account_ids=self.account_ids.take(selector),
+            categories=self.categories.take(selector),
+        )
+
+
+class TransactionTableBuilder:
+    """Appends transactions into compact buffers and builds a TransactionTable."""
+
+    def __init__(self) -> None:
+        self._days = array("q")
+        self._amounts = array("q")
+        self._descriptions = DictionaryEncoder()
+        self._currencies = DictionaryEncoder()
+        self._account_ids = DictionaryEncoder()
+        self._categories = DictionaryEncoder()
+
+    def add(self, transaction: Transaction) -> None:
+        self._days.append(transaction.date.toordinal() - EPOCH_ORDINAL)
+        self._amounts.append(to_cents(transaction.amount))
+        self._descriptions.add(transaction.description)
+        self._currencies.add(transaction.currency)
+        self._account_ids.add(transaction.account_id)
+        self._categories.add(transaction.category)
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        for transaction in transactions:
+            self.add(transaction)
+
+    def build(self) -> TransactionTable:
+        return TransactionTable(
+            dates=np.frombuffer(self._days, dtype=np.int64).astype("datetime64[D]"),
+            amounts=np.frombuffer(self._amounts, dtype=np.int64).copy(),
+            descriptions=_categorical(self._descriptions),
+            currencies=_categorical(self._currencies),
+            account_ids=_categorical(self._account_ids),
+            categories=_categorical(self._categories),
+        )
+
+
+def _categorical(encoder: DictionaryEncoder) -> Categorical:
+    return Categorical(
+        np.frombuffer(encoder.codes, dtype=np.int32).copy(), encoder.values
+    )
@@ -0,0 +1,264 @@
+"""
+Cross-statement deduplication of transactions.
+
+Each transaction is reduced to a 64-bit fingerprint of its account, date,
+amount in cents and normalized description. Already-ingested fingerprints
+are kept in a sorted file that is memory-mapped and binary searched, with an
+optional Bloom filter in front of it, so merging a new statement costs
+O(new transactions) lookups whatever the size of the history.
+"""
+
+import bisect
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import struct
+from array import array
+from collections import Counter
+from typing import BinaryIO, Iterable, Iterator, Optional, Sequence
+from statement_ingestor.models import (
+    Statement,
+    StatementBuilder,
+    Transaction,
+    to_cents,
+)
+from statement_ingestor.normalize import normalize_description
+
+_FINGERPRINTS_FILE = "fingerprints.bin"
+_BLOOM_FILE = "bloom.bin"
+_BLOOM_HEADER = struct.Struct("<QQQ")
+
+
+def fingerprint(transaction: Transaction, occurrence: int = 0) -> int:
+    """
+    Returns a signed 64-bit fingerprint of the transaction.
+
+    ``occurrence`` tells apart identical transactions within one statement
+    (two equal coffees on the same day), so the n-th copy in a statement only
+    matches the n-th copy in another.
+    """
+    key = "\x1f".join(
+        [
+            transaction.account_id,
+            transaction.date.isoformat(),
+            str(to_cents(transaction.amount)),
+            normalize_description(transaction.description),
+            str(occurrence),
+        ]
+    )
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def fingerprints(
+    transactions: Iterable[Transaction],
+) -> Iterator[tuple[int, Transaction]]:
+    """Yields each transaction with its fingerprint, numbering repeated ones."""
+    seen: Counter[int] = Counter()
+    for transaction in transactions:
+        base = fingerprint(transaction)
+        occurrence = seen[base]
+        seen[base] += 1
+        if occurrence:
+            yield fingerprint(transaction, occurrence), transaction
+        else:
+            yield base, transaction
+
+
+class BloomFilter:
+    """A Bloom filter over 64-bit fingerprints, using double hashing."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = max(
+            8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, fingerprint: int) -> None:
+        for position in self._positions(fingerprint):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, fingerprint: int) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(fingerprint)
+        )
+
+    def save(self, path: str) -> None:
+        """Writes the filter to a temporary file and renames it over ``path``."""
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as outfile:
+            outfile.write(
+                _BLOOM_HEADER.pack(self.capacity, self.hash_count, self.count)
+            )
+            outfile.write(struct.pack("<d", self.error_rate))
+            outfile.write(self._bits)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        with open(path, "rb") as infile:
+            capacity, hash_count, count = _BLOOM_HEADER.unpack(
+                infile.read(_BLOOM_HEADER.size)
+            )
+            (error_rate,) = struct.unpack("<d", infile.read(8))
+            bloom = cls(capacity, error_rate)
+            bloom.hash_count = hash_count
+            bloom.count = count
+            bloom._bits = bytearray(infile.read())
+        if len(bloom._bits) != (bloom.size + 7) // 8:
+            raise ValueError(f"Truncated Bloom filter: {path}")
+        return bloom
+
+    def _positions(self, fingerprint: int) -> Iterator[int]:
+        value = fingerprint & 0xFFFFFFFFFFFFFFFF
+        first = value & 0xFFFFFFFF
+        second = (value >> 32) | 1
+        size = self.size
+        for index in range(self.hash_count):
+            yield (first + index * second) % size
+
+
+class DedupIndex:
+    """
+    The fingerprints of every transaction merged so far.
+
+    With a ``directory`` the index is persisted there by ``save``: the
+    fingerprints as a sorted array of int64 that is memory-mapped on load,
+    and the Bloom filter next to it. Without one it only lives in memory.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        use_bloom: bool = True,
+        bloom_capacity: int = 1_000_000,
+        error_rate: float = 0.01,
+    ):
+        self.directory = directory
+        self.error_rate = error_rate
+        self._new: set[int] = set()
+        self._file: Optional[BinaryIO] = None
+        self._map: Optional[mmap.mmap] = None
+        self._stored: Sequence[int] = ()
+        self.bloom: Optional[BloomFilter] = None
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._open_stored()
+            bloom_path = os.path.join(directory, _BLOOM_FILE)
+            if use_bloom and os.path.exists(bloom_path):
+                self.bloom = _load_bloom(bloom_path, len(self._stored))
+        if use_bloom and self.bloom is None:
+            self.bloom = _build_bloom(
+                self._stored, max(bloom_capacity, 2 * len(self._stored)), error_rate
+            )
+
+    def __len__(self) -> int:
+        return len(self._stored) + len(self._new)
+
+    def __contains__(self, fingerprint: int) -> bool:
+        if self.bloom is not None and fingerprint not in self.bloom:
+            return False
+        if fingerprint in self._new:
+            return True
+        stored = self._stored
+        index = bisect.bisect_left(stored, fingerprint)  # type: ignore[arg-type]
+        return index < len(stored) and stored[index] == fingerprint
+
+    def add(self, fingerprint: int) -> None:
+        self._new.add(fingerprint)
+        if self.bloom is not None:
+            self.bloom.add(fingerprint)
+
+    def merge(self, statement: Statement) -> Statement:
+        """
+        Records the statement's transactions and returns a statement holding
+        only the ones not seen before.
+        """
+        builder = StatementBuilder(statement.account_id, statement.account_type)
+        for key, transaction in fingerprints(statement.transactions):
+            if key not in self:
+                self.add(key)
+                builder.add(transaction)
+        return builder.build()
+
+    def save(self) -> None:
+        """Folds the new fingerprints into the sorted file on disk."""
+        if self.directory is None:
+            raise ValueError("DedupIndex without a directory cannot be saved")
+
+        path = os.path.join(self.directory, _FINGERPRINTS_FILE)
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as outfile:
+            chunk = array("q")
+            for value in heapq.merge(self._stored, sorted(self._new)):
+                chunk.append(value)
+                if len(chunk) >= 65536:
+                    chunk.tofile(outfile)
+                    del chunk[:]
+            chunk.tofile(outfile)
+        self.close()
+        os.replace(temporary, path)
+        self._new.clear()
+        self._open_stored()
+
+        if self.bloom is not None:
+            if self.bloom.count > self.bloom.capacity:
+                # Past its capacity the false-positive rate climbs; rebuild larger.
+                self.bloom = _build_bloom(
+                    self._stored, 2 * len(self._stored), self.error_rate
+                )
+            self.bloom.save(os.path.join(self.directory, _BLOOM_FILE))
+
+    def close(self) -> None:
+        if isinstance(self._stored, memoryview):
+            self._stored.release()
+        self._stored = ()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open_stored(self) -> None:
+        assert self.directory is not None
+        path = os.path.join(self.directory, _FINGERPRINTS_FILE)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        with memoryview(self._map) as view:
+            self._stored = view.cast("q")
+
+
+def _load_bloom(path: str, stored: int) -> Optional[BloomFilter]:
+    """
+    Loads the saved Bloom filter, or returns None, so it gets rebuilt from the
+    fingerprints, if it is unreadable or does not hold exactly the stored
+    fingerprints (a save interrupted between the two files). A filter missing
+    keys would report stored transactions as new.
+    """
+    try:
+        bloom = BloomFilter.load(path)
+    except (ValueError, struct.error):
+        return None
+    return bloom if bloom.count == stored else None
+
+
+def _build_bloom(
+    fingerprints: Iterable[int], capacity: int, error_rate: float
+) -> BloomFilter:
+    bloom = BloomFilter(capacity, error_rate)
+    for value in fingerprints:
+        bloom.add(value)
+    return bloom
@@ -0,0 +1,160 @@
+"""
+Installment purchases on credit card statements.
+
+Card statements list each installment of a purchase as its own line, with an
+``n/N`` suffix on the description ("LOJA X 03/10"). ``InstallmentTracker``
+links those lines across statements through a hash index on the purchase
+(card, merchant, per-installment amount, number of installments and first
+bill), and keeps a running projection of the installments still to be
+billed, updated per statement without going back over earlier ones.
+"""
+
+import json
+import re
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Optional
+from statement_ingestor.models import Statement, to_cents
+from statement_ingestor.normalize import normalize_description
+
+_INSTALLMENT_PATTERN = re.compile(r"\s(\d{2})/(\d{2})$")
+
+PurchaseKey = tuple[str, str, int, int, str]
+
+
+def parse_installment(description: str) -> Optional[tuple[str, int, int]]:
+    """
+    Splits "LOJA X 03/10" into ("LOJA X", 3, 10). Returns None for
+    descriptions without an installment suffix.
+    """
+    # Cheap gate: most descriptions do not end in "dd/dd".
+    if len(description) < 7 or description[-3] != "/":
+        return None
+    match = _INSTALLMENT_PATTERN.search(description)
+    if match is None:
+        return None
+    installment, installments = int(match.group(1)), int(match.group(2))
+    if not 1 <= installment <= installments or installments < 2:
+        return None
+    return description[: match.start()].rstrip(), installment, installments
+
+
+@dataclass
+class Purchase:
+    account_id: str
+    merchant: str
+    installment_cents: int
+    installments: int
+    first_bill: str
+    """Month of the bill holding the first installment, as ``YYYY-MM``."""
+    last_installment: int
+    """The highest installment seen so far."""
+
+    @property
+    def remaining(self) -> int:
+        return self.installments - self.last_installment
+
+    def future_bills(self) -> list[str]:
+        """The months (``YYYY-MM``) of the bills with the remaining installments."""
+        return [
+            _add_months(self.first_bill, number - 1)
+            for number in range(self.last_installment + 1, self.installments + 1)
+        ]
+
+    @property
+    def key(self) -> PurchaseKey:
+        return (
+            self.account_id,
+            normalize_description(self.merchant),
+            self.installment_cents,
+            self.installments,
+            self.first_bill,
+        )
+
+
+class InstallmentTracker:
+    """
+    Follows installment purchases across statements and projects the
+    installments left to pay into the bills they will fall on.
+
+    Statements must carry a ``due_date``; each is attributed to the bill of
+    that month. Ingesting a statement only touches the purchases it lists,
+    and the projection is adjusted by their difference, so the cost of
+    ``add`` does not grow with the history.
+    """
+
+    def __init__(self) -> None:
+        self.purchases: dict[PurchaseKey, Purchase] = {}
+        self._projection: defaultdict[str, int] = defaultdict(int)
+
+    def add(self, statement: Statement) -> list[Purchase]:
+        """Records a statement's installments and returns the purchases updated."""
+        if statement.due_date is None:
+            raise ValueError("Installments need a statement with a due date")
+        bill = statement.due_date.strftime("%Y-%m")
+
+        updated = []
+        for transaction in statement.transactions:
+            parsed = parse_installment(transaction.description)
+            if parsed is None:
+                continue
+            merchant, installment, installments = parsed
+            purchase = Purchase(
+                account_id=transaction.account_id,
+                merchant=merchant,
+                installment_cents=to_cents(transaction.amount),
+                installments=installments,
+                first_bill=_add_months(bill, 1 - installment),
+                last_installment=installment,
+            )
+            known = self.purchases.get(purchase.key)
+            if known is None:
+                self.purchases[purchase.key] = purchase
+                self._project(purchase, 1)
+                updated.append(purchase)
+            elif installment > known.last_installment:
+                self._project(known, -1)
+                known.last_installment = installment
+                self._project(known, 1)
+                updated.append(known)
+        return updated
+
+    def projection(self, after: Optional[date] = None) -> dict[str, int]:
+        """
+        Returns the cents still to be billed per month (``YYYY-MM``), for the
+        months after ``after`` if given.
+        """
+        start = after.strftime("%Y-%m") if after else ""
+        return {
+            month: cents
+            for month, cents in sorted(self._projection.items())
+            if cents and month > start
+        }
+
+    def open_purchases(self) -> list[Purchase]:
+        return [purchase for purchase in self.purchases.values() if purchase.remaining]
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as outfile:
+            json.dump([asdict(p) for p in self.purchases.values()], outfile)
+
+    @classmethod
+    def load(cls, path: str) -> "InstallmentTracker":
+        tracker = cls()
+        with open(path, "r", encoding="utf-8") as infile:
+            for fields in json.load(infile):
+                purchase = Purchase(**fields)
+                tracker.purchases[purchase.key] = purchase
+                tracker._project(purchase, 1)
+        return tracker
+
+    def _project(self, purchase: Purchase, sign: int) -> None:
+        for month in purchase.future_bills():
+            self._projection[month] += sign * purchase.installment_cents
+
+
+def _add_months(month: str, count: int) -> str:
+    """Shifts a ``YYYY-MM`` month by ``count`` months."""
+    index = int(month[:4]) * 12 + int(month[5:]) - 1 + count
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
@@ -0,0 +1,193 @@
+"""
+Per-stage timings and counters for ingestion.
+
+Parsers report into ``BaseParser.metrics``, which defaults to ``NULL_METRICS``:
+its methods do nothing and parsers check ``metrics.enabled`` before wrapping
+their iterators, so uninstrumented parsing keeps its fast path.
+
+Stage timings are exclusive: while a nested stage runs, the enclosing one is
+paused. Pulling a transaction through a streaming parser runs the parse stage,
+which in turn pulls pages from the extract stage, and each second is charged
+to exactly one of them.
+"""
+
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Callable, ContextManager, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+StageHook = Callable[[str, float], None]
+"""Called with a stage name and the seconds just spent in it."""
+CountHook = Callable[[str, int], None]
+"""Called with a counter name and the amount just added to it."""
+
+
+class Metrics:
+    """
+    Accumulates stage timings and counters across every parse it is given to.
+    Stages are tracked as a stack, so an instance must not be shared by
+    parses running concurrently on different threads.
+
+    :param stage_hooks: callables notified with every slice of time charged
+        to a stage, that is whenever a stage is left or paused.
+    :param count_hooks: callables notified each time a counter changes.
+    """
+
+    enabled = True
+
+    def __init__(
+        self,
+        stage_hooks: Iterable[StageHook] = (),
+        count_hooks: Iterable[CountHook] = (),
+    ):
+        self.stage_hooks = list(stage_hooks)
+        self.count_hooks = list(count_hooks)
+        self.seconds: defaultdict[str, float] = defaultdict(float)
+        self.calls: defaultdict[str, int] = defaultdict(int)
+        self.counters: defaultdict[str, int] = defaultdict(int)
+        self._stack: list[str] = []
+        self._started = 0.0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Times the block as ``name``, pausing the enclosing stage meanwhile."""
+        self._enter(name)
+        try:
+            yield
+        finally:
+            self._leave()
+
+    def timed(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Yields from ``iterable``, timing the production of each item."""
+        iterator = iter(iterable)
+        enter, leave = self._enter, self._leave
+        while True:
+            enter(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                leave()
+            yield item
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+        for hook in self.count_hooks:
+            hook(name, amount)
+
+    def counted(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Yields from ``iterable``, then adds the number of items to ``name``."""
+        total = 0
+        try:
+            for item in iterable:
+                total += 1
+                yield item
+        finally:
+            self.count(name, total)
+
+    def reset(self) -> None:
+        self.seconds.clear()
+        self.calls.clear()
+        self.counters.clear()
+
+    def to_dict(self) -> dict:
+        return {
+            "stages": {
+                name: {"seconds": seconds, "calls": self.calls[name]}
+                for name, seconds in sorted(self.seconds.items())
+            },
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def to_prometheus(
+        self, prefix: str = "statement_ingestor", labels: Optional[dict] = None
+    ) -> str:
+        """Renders the metrics in the Prometheus text exposition format."""
+        base = [
+            f'{key}="{_escape(str(value))}"' for key, value in (labels or {}).items()
+        ]
+
+        def sample(name: str, value: float, extra: Optional[str] = None) -> str:
+            pairs = base + ([extra] if extra else [])
+            return (
+                f"{name}{{{','.join(pairs)}}} {value}" if pairs else f"{name} {value}"
+            )
+
+        lines = [
+            f"# HELP {prefix}_stage_seconds_total Time spent in each ingestion stage.",
+            f"# TYPE {prefix}_stage_seconds_total counter",
+        ]
+        for name, seconds in sorted(self.seconds.items()):
+            lines.append(
+                sample(f"{prefix}_stage_seconds_total", seconds, f'stage="{name}"')
+            )
+        lines += [
+            f"# HELP {prefix}_stage_calls_total Times each ingestion stage was entered.",
+            f"# TYPE {prefix}_stage_calls_total counter",
+        ]
+        for name, calls in sorted(self.calls.items()):
+            lines.append(
+                sample(f"{prefix}_stage_calls_total", calls, f'stage="{name}"')
+            )
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(sample(f"{prefix}_{name}_total", value))
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, **kwargs) -> None:
+        """
+        Writes ``to_prometheus()`` to ``path`` atomically, as expected by the
+        node exporter's textfile collector.
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as outfile:
+            outfile.write(self.to_prometheus(**kwargs))
+        os.replace(temporary, path)
+
+    def _enter(self, name: str) -> None:
+        now = time.perf_counter()
+        if self._stack:
+            self._charge(self._stack[-1], now - self._started)
+        self._stack.append(name)
+        self._started = now
+
+    def _leave(self) -> None:
+        now = time.perf_counter()
+        name = self._stack.pop()
+        self._charge(name, now - self._started)
+        self.calls[name] += 1
+        self._started = now
+
+    def _charge(self, name: str, seconds: float) -> None:
+        self.seconds[name] += seconds
+        for hook in self.stage_hooks:
+            hook(name, seconds)
+
+
+class _NullMetrics(Metrics):
+    """Metrics that record nothing, used when instrumentation is off."""
+
+    enabled = False
+
+    def stage(self, name: str) -> ContextManager[None]:  # type: ignore[override]
+        return nullcontext()
+
+    def timed(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        return iter(iterable)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        pass
+
+    def counted(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        return iter(iterable)
+
+
+NULL_METRICS: Metrics = _NullMetrics()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
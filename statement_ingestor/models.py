@@ -1,6 +1,9 @@
+import sys
+from array import array
 from dataclasses import dataclass
 from datetime import date
 from enum import Enum
+from typing import Any, Iterable, Mapping, Optional
 
 
 class AccountType(Enum):
@@ -9,6 +12,38 @@ class AccountType(Enum):
     INVESTMENT = "investment"
 
 
+def to_cents(amount: float) -> int:
+    """Converts a two-decimal amount to an exact integer number of cents."""
+    return round(amount * 100)
+
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+"""Ordinal of 1970-01-01, for dates stored as days since the Unix epoch."""
+
+
+class DictionaryEncoder:
+    """
+    Dictionary-encodes a column of strings as it is filled: ``codes`` holds an
+    int32 per value, indexing ``values`` in order of first appearance. The
+    columnar and Arrow builders share it and wrap the buffers in their own
+    array types.
+    """
+
+    def __init__(self) -> None:
+        self.codes = array("i")
+        self._index: dict[Optional[str], int] = {}
+
+    def add(self, value: Optional[str]) -> None:
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self._index)
+        self.codes.append(code)
+
+    @property
+    def values(self) -> list[Optional[str]]:
+        return list(self._index)
+
+
 @dataclass
 class Transaction:
     date: date
@@ -20,6 +55,59 @@ class Transaction:
     metadata: dict | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class CompactTransaction:
+    """
+    An immutable, slotted counterpart of Transaction for holding millions of
+    transactions at once.
+
+    Amounts are exact integer cents, so totals do not drift. Currency, account
+    and category strings are interned, so every transaction of an account
+    shares a single copy. ``metadata`` stays None unless it is set.
+    """
+
+    date: date
+    description: str
+    amount_cents: int
+    currency: str
+    account_id: str
+    category: str | None = None
+    metadata: Mapping[str, Any] | None = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "currency", sys.intern(self.currency))
+        object.__setattr__(self, "account_id", sys.intern(self.account_id))
+        if self.category is not None:
+            object.__setattr__(self, "category", sys.intern(self.category))
+
+    @property
+    def amount(self) -> float:
+        return self.amount_cents / 100
+
+    @classmethod
+    def from_transaction(cls, transaction: Transaction) -> "CompactTransaction":
+        return cls(
+            date=transaction.date,
+            description=transaction.description,
+            amount_cents=to_cents(transaction.amount),
+            currency=transaction.currency,
+            account_id=transaction.account_id,
+            category=transaction.category,
+            metadata=transaction.metadata or None,
+        )
+
+    def to_transaction(self) -> Transaction:
+        return Transaction(
+            date=self.date,
+            description=self.description,
+            amount=self.amount,
+            currency=self.currency,
+            account_id=self.account_id,
+            category=self.category,
+            metadata=dict(self.metadata) if self.metadata is not None else None,
+        )
+
+
 @dataclass
 class Statement:
     account_id: str
@@ -27,3 +115,42 @@ class Statement:
     transactions: list[Transaction]
     start_date: date | None = None
     end_date: date | None = None
+    due_date: date | None = None
+    """The payment due date, for credit card statements that show one."""
+
+
+class StatementBuilder:
+    """
+    Builds a Statement from a stream of transactions, tracking the start and
+    end dates as each transaction is added instead of rescanning the list.
+    """
+
+    def __init__(self, account_id: str, account_type: AccountType):
+        self.account_id = account_id
+        self.account_type = account_type
+        self.transactions: list[Transaction] = []
+        self.start_date: date | None = None
+        self.end_date: date | None = None
+        self.due_date: date | None = None
+
+    def add(self, transaction: Transaction) -> None:
+        transaction_date = transaction.date
+        if self.start_date is None or transaction_date < self.start_date:
+            self.start_date = transaction_date
+        if self.end_date is None or transaction_date > self.end_date:
+            self.end_date = transaction_date
+        self.transactions.append(transaction)
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        for transaction in transactions:
+            self.add(transaction)
+
+    def build(self) -> Statement:
+        return Statement(
+            account_id=self.account_id,
+            account_type=self.account_type,
+            transactions=self.transactions,
+            start_date=self.start_date,
+            end_date=self.end_date,
+            due_date=self.due_date,
+        )
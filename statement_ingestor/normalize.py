@@ -0,0 +1,18 @@
+"""
+Text normalization shared by the matching stages (deduplication,
+categorization, reconciliation).
+"""
+
+import unicodedata
+from functools import lru_cache
+
+
+@lru_cache(maxsize=65536)
+def normalize_description(description: str) -> str:
+    """
+    Folds accents and case and collapses whitespace, so that
+    "Padaria  Pão de Ouro" and "PADARIA PAO DE OURO" compare equal.
+    """
+    decomposed = unicodedata.normalize("NFKD", description)
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(folded.casefold().split())
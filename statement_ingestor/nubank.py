@@ -1,4 +1,78 @@
+"""
+Shared CSV reading for the Nubank exports.
+
+Rows are read with a plain ``csv.reader`` and the needed columns picked by
+index, instead of building a dict per row. Dates repeat heavily in these
+exports, so they are parsed by slicing and memoized.
+"""
+
 import csv
-from datetime import datetime, timedelta, date
-from decimal import Decimal
-from statement_ingestor.models import AccountType, Statement, Transaction
+import re
+from datetime import datetime, date
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+_DMY_PATTERN = re.compile(r"\d{2}/\d{2}/\d{4}", re.ASCII)
+_ISO_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}", re.ASCII)
+
+
+def iter_columns(infile: Iterable[str], *columns: str) -> Iterator[tuple[Any, ...]]:
+    """
+    Yields the requested columns of every row, as a tuple in the order given.
+
+    Header names are stripped of whitespace and of a leading byte order mark.
+    Otherwise mirrors ``csv.DictReader`` semantics: blank lines are skipped, a
+    column repeated in the header takes its last occurrence, missing trailing
+    values are None and a missing column raises KeyError once there is a row
+    to read.
+    """
+    reader = csv.reader(infile)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    # Normalized as sniff_header reads it, so a file detected as a Nubank
+    # export despite a byte order mark or padded names also parses.
+    header[0] = header[0].lstrip("\ufeff")
+    positions = {name.strip(): index for index, name in enumerate(header)}
+    getter: Optional[Callable[[list[str]], tuple[Any, ...]]] = None
+    width = 0
+    for row in reader:
+        if not row:
+            continue
+        if getter is None:
+            indices = [positions[column] for column in columns]
+            if len(indices) == 1:
+                # itemgetter returns a bare value, not a 1-tuple, for one index.
+                (index,) = indices
+                getter = lambda values: (values[index],)
+            else:
+                getter = itemgetter(*indices)
+            width = max(indices) + 1
+        if len(row) < width:
+            row = row + [None] * (width - len(row))  # type: ignore[list-item]
+        yield getter(row)
+
+
+def sniff_header(head: bytes, *columns: str) -> bool:
+    """Tells whether the CSV header at the start of ``head`` has all ``columns``."""
+    first_line = head.split(b"\n", 1)[0].decode("utf-8-sig", errors="ignore")
+    header = next(csv.reader([first_line]), [])
+    return set(columns).issubset(name.strip() for name in header)
+
+
+@lru_cache(maxsize=8192)
+def parse_dmy_date(value: str) -> date:
+    """Parses a ``%d/%m/%Y`` date."""
+    if _DMY_PATTERN.fullmatch(value):
+        return date(int(value[6:]), int(value[3:5]), int(value[:2]))
+    return datetime.strptime(value, "%d/%m/%Y").date()
+
+
+@lru_cache(maxsize=8192)
+def parse_iso_date(value: str) -> date:
+    """Parses a ``%Y-%m-%d`` date."""
+    if _ISO_PATTERN.fullmatch(value):
+        return date(int(value[:4]), int(value[5:7]), int(value[8:]))
+    return datetime.strptime(value, "%Y-%m-%d").date()
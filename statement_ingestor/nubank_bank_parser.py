@@ -1,40 +1,134 @@
-import csv
-from datetime import datetime, date
-from statement_ingestor.models import AccountType, Statement, Transaction
+import hashlib
+import io
+import json
+from dataclasses import asdict, dataclass
+from itertools import chain
+from typing import Iterable, Iterator, Optional
+from statement_ingestor.models import (
+    AccountType,
+    Statement,
+    StatementBuilder,
+    Transaction,
+)
 from statement_ingestor.base_parser import BaseParser
+from statement_ingestor.nubank import iter_columns, parse_dmy_date, sniff_header
+from statement_ingestor.registry import register
+from statement_ingestor.sources import Source, open_text
 
+_TAIL_SIZE = 4096
 
+
+@dataclass
+class Checkpoint:
+    """
+    Where an incremental parse of a growing export stopped: the byte offset
+    just past the last row read, the number of rows read so far, the header
+    line and a hash of the bytes right before the offset.
+    """
+
+    offset: int
+    row_count: int
+    header: str
+    tail_hash: str
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as outfile:
+            json.dump(asdict(self), outfile)
+
+    @classmethod
+    def load(cls, path: str) -> "Checkpoint":
+        with open(path, "r", encoding="utf-8") as infile:
+            return cls(**json.load(infile))
+
+
+@dataclass
+class IncrementalResult:
+    statement: Statement
+    checkpoint: Checkpoint
+    full: bool
+    """True when the file no longer extends the checkpoint and was reparsed."""
+
+
+@register
 class NubankBankParser(BaseParser):
-    def parse(self, file_path: str) -> Statement:
-        transactions = []
-        with open(file_path, "r", encoding="utf-8") as infile:
-            reader = csv.DictReader(infile)
-            for row in reader:
-                transactions.append(
-                    Transaction(
-                        date=datetime.strptime(row["Data"], "%d/%m/%Y").date(),
-                        description=row["Descrição"],
-                        amount=float(row["Valor"]),
-                        currency="BRL",
-                        account_id="nubank_bank_0000",
-                    )
-                )
-        if not transactions:
-            return Statement(
-                account_id="nubank_bank_0000",
-                account_type=AccountType.BANK,
-                transactions=[],
-                start_date=None,
-                end_date=None,
-            )
+    name = "nubank-bank"
+    account_id = "nubank_bank_0000"
+    account_type = AccountType.BANK
+
+    @classmethod
+    def sniff(cls, source: Source, head: bytes) -> bool:
+        return sniff_header(head, "Data", "Descrição", "Valor")
 
-        start_date = min(t.date for t in transactions)
-        end_date = max(t.date for t in transactions)
+    def iter_transactions(self, source: Source) -> Iterator[Transaction]:
+        with open_text(source) as infile:
+            yield from self._transactions(infile)
 
-        return Statement(
-            account_id="nubank_bank_0000",
-            account_type=AccountType.BANK,
-            transactions=transactions,
-            start_date=start_date,
-            end_date=end_date,
+    def parse_incremental(
+        self, file_path: str, checkpoint: Optional[Checkpoint] = None
+    ) -> IncrementalResult:
+        """
+        Parses only the rows appended to a cumulative export since
+        ``checkpoint``.
+
+        The export is expected to grow by appending rows. If the header or the
+        bytes right before the checkpoint changed, or the file shrank, the
+        whole file is parsed again and ``full`` is set on the result.
+        """
+        builder = StatementBuilder(self.account_id, self.account_type)
+        with open(file_path, "rb") as infile:
+            header = infile.readline().decode("utf-8")
+            full = checkpoint is None or not _extends(infile, header, checkpoint)
+
+            if checkpoint is None or full:
+                infile.seek(0)
+                text = io.TextIOWrapper(infile, encoding="utf-8")
+                lines: Iterable[str] = text
+                row_count = 0
+            else:
+                infile.seek(checkpoint.offset)
+                text = io.TextIOWrapper(infile, encoding="utf-8")
+                lines = chain([header], text)
+                row_count = checkpoint.row_count
+
+            for transaction in self._transactions(lines):
+                builder.add(transaction)
+                row_count += 1
+            text.detach()
+
+            offset = infile.tell()
+            start = max(offset - _TAIL_SIZE, 0)
+            infile.seek(start)
+            tail_hash = hashlib.sha256(infile.read(offset - start)).hexdigest()
+
+        return IncrementalResult(
+            statement=builder.build(),
+            checkpoint=Checkpoint(
+                offset=offset,
+                row_count=row_count,
+                header=header,
+                tail_hash=tail_hash,
+            ),
+            full=full,
         )
+
+    def _transactions(self, lines: Iterable[str]) -> Iterator[Transaction]:
+        account_id = self.account_id
+        rows = iter_columns(lines, "Data", "Descrição", "Valor")
+        for day, description, amount in self.metrics.counted("rows", rows):
+            # Positional arguments keep the per-row constructor call cheap.
+            yield Transaction(
+                parse_dmy_date(day), description, float(amount), "BRL", account_id
+            )
+
+
+def _extends(infile: io.BufferedReader, header: str, checkpoint: Checkpoint) -> bool:
+    """Tells whether the open file still starts with what the checkpoint read."""
+    if header != checkpoint.header:
+        return False
+
+    start = max(checkpoint.offset - _TAIL_SIZE, 0)
+    infile.seek(start)
+    tail = infile.read(checkpoint.offset - start)
+    if len(tail) != checkpoint.offset - start:
+        return False
+    return hashlib.sha256(tail).hexdigest() == checkpoint.tail_hash
@@ -1,41 +1,27 @@
-import csv
-from datetime import datetime, date
-from statement_ingestor.models import AccountType, Statement, Transaction
+from typing import Iterator
+from statement_ingestor.models import AccountType, Transaction
 from statement_ingestor.base_parser import BaseParser
+from statement_ingestor.nubank import iter_columns, parse_iso_date, sniff_header
+from statement_ingestor.registry import register
+from statement_ingestor.sources import Source, open_text
 
 
+@register
 class NubankCreditCardParser(BaseParser):
-    def parse(self, file_path: str) -> Statement:
-        transactions = []
-        with open(file_path, "r", encoding="utf-8") as infile:
-            reader = csv.DictReader(infile)
-            for row in reader:
-                transactions.append(
-                    Transaction(
-                        date=datetime.strptime(row["date"], "%Y-%m-%d").date(),
-                        description=row["title"],
-                        amount=float(row["amount"]),
-                        currency="BRL",
-                        account_id="nubank_card_0000",
-                    )
-                )
-
-        if not transactions:
-            return Statement(
-                account_id="nubank_card_0000",
-                account_type=AccountType.CREDIT_CARD,
-                transactions=[],
-                start_date=None,
-                end_date=None,
-            )
+    name = "nubank-card"
+    account_id = "nubank_card_0000"
+    account_type = AccountType.CREDIT_CARD
 
-        start_date = min(t.date for t in transactions)
-        end_date = max(t.date for t in transactions)
+    @classmethod
+    def sniff(cls, source: Source, head: bytes) -> bool:
+        return sniff_header(head, "date", "title", "amount")
 
-        return Statement(
-            account_id="nubank_card_0000",
-            account_type=AccountType.CREDIT_CARD,
-            transactions=transactions,
-            start_date=start_date,
-            end_date=end_date,
-        )
+    def iter_transactions(self, source: Source) -> Iterator[Transaction]:
+        account_id = self.account_id
+        with open_text(source) as infile:
+            rows = iter_columns(infile, "date", "title", "amount")
+            for day, description, amount in self.metrics.counted("rows", rows):
+                # Positional arguments keep the per-row constructor call cheap.
+                yield Transaction(
+                    parse_iso_date(day), description, float(amount), "BRL", account_id
+                )
@@ -0,0 +1,121 @@
+"""
+Matching of transactions across accounts, such as a card statement's bill
+payment against the bank debit that paid it.
+
+The transactions on one side are bucketed by amount in cents, each bucket
+sorted by date, so every transaction on the other side only looks at the
+candidates with the same amount inside the day window, found by bisection.
+Reconciling n against m transactions costs O((n + m) log m) instead of
+comparing every pair.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterable, Optional
+from statement_ingestor.models import Transaction, to_cents
+from statement_ingestor.normalize import normalize_description
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+@dataclass
+class Reconciliation:
+    matched: list[tuple[Transaction, Transaction]] = field(default_factory=list)
+    """Pairs of a transaction from the left side and its match on the right."""
+    unmatched_left: list[Transaction] = field(default_factory=list)
+    unmatched_right: list[Transaction] = field(default_factory=list)
+
+
+class Reconciler:
+    """
+    Pairs transactions of equal amount whose dates are at most
+    ``window_days`` apart and whose descriptions are at least
+    ``min_similarity`` alike (Jaccard similarity of their normalized words,
+    from 0 to 1). Each transaction is matched at most once; among several
+    candidates the most similar description wins, then the closest date.
+
+    :param opposite_sign: match a left amount against its negation on the
+        right. The parsers in this package record both a card bill payment
+        and the bank debit paying it as negative amounts, so pairs between
+        them have the same sign and this is off by default; turn it on for
+        sources that record the payment as a credit on the card.
+    """
+
+    def __init__(
+        self,
+        window_days: int = 3,
+        min_similarity: float = 0.0,
+        opposite_sign: bool = False,
+    ):
+        self.window_days = window_days
+        self.min_similarity = min_similarity
+        self.opposite_sign = opposite_sign
+
+    def reconcile(
+        self, left: Iterable[Transaction], right: Iterable[Transaction]
+    ) -> Reconciliation:
+        candidates = list(right)
+        buckets: defaultdict[int, list[tuple[int, int]]] = defaultdict(list)
+        for index, transaction in enumerate(candidates):
+            buckets[to_cents(transaction.amount)].append(
+                (transaction.date.toordinal(), index)
+            )
+        for bucket in buckets.values():
+            bucket.sort()
+
+        sign = -1 if self.opposite_sign else 1
+        result = Reconciliation()
+        for transaction in sorted(left, key=lambda t: t.date):
+            bucket = buckets.get(sign * to_cents(transaction.amount), [])
+            position = self._best_candidate(transaction, bucket, candidates)
+            if position is None:
+                result.unmatched_left.append(transaction)
+                continue
+            _, index = bucket.pop(position)
+            result.matched.append((transaction, candidates[index]))
+
+        result.unmatched_right = sorted(
+            (candidates[index] for bucket in buckets.values() for _, index in bucket),
+            key=lambda t: t.date,
+        )
+        return result
+
+    def _best_candidate(
+        self,
+        transaction: Transaction,
+        bucket: list[tuple[int, int]],
+        candidates: list[Transaction],
+    ) -> Optional[int]:
+        """Returns the position in ``bucket`` of the best match, if any."""
+        day = transaction.date.toordinal()
+        start = bisect_left(bucket, (day - self.window_days, -1))
+        stop = bisect_right(bucket, (day + self.window_days, len(candidates)))
+
+        best = None
+        best_key = None
+        for position in range(start, stop):
+            candidate_day, index = bucket[position]
+            score = similarity(transaction.description, candidates[index].description)
+            if score < self.min_similarity:
+                continue
+            key = (-score, abs(candidate_day - day))
+            if best_key is None or key < best_key:
+                best, best_key = position, key
+        return best
+
+
+def similarity(first: str, second: str) -> float:
+    """Jaccard similarity of the words of two normalized descriptions."""
+    first_tokens, second_tokens = _tokens(first), _tokens(second)
+    if not first_tokens and not second_tokens:
+        return 1.0
+    union = len(first_tokens | second_tokens)
+    return len(first_tokens & second_tokens) / union
+
+
+@lru_cache(maxsize=65536)
+def _tokens(description: str) -> frozenset[str]:
+    return frozenset(_TOKEN_PATTERN.findall(normalize_description(description)))
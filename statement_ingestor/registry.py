@@ -0,0 +1,62 @@
+"""
+Registry of the available parsers, used to pick a parser for a file by
+sniffing its first bytes instead of trial-parsing it.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Optional, TypeVar
+from statement_ingestor.sources import Source, is_path, read_head
+
+if TYPE_CHECKING:
+    from statement_ingestor.base_parser import BaseParser
+    from statement_ingestor.models import Statement
+
+SNIFF_SIZE = 4096
+
+_BUILTIN_MODULES = [
+    "statement_ingestor.nubank_bank_parser",
+    "statement_ingestor.nubank_credit_card_parser",
+    "statement_ingestor.bradesco_credit_card_parser",
+]
+_PARSERS: list[type["BaseParser"]] = []
+
+P = TypeVar("P", bound=type["BaseParser"])
+
+
+def register(parser_class: P) -> P:
+    """Class decorator adding a parser to the registry, in sniffing order."""
+    if parser_class not in _PARSERS:
+        _PARSERS.append(parser_class)
+    return parser_class
+
+
+def registered_parsers() -> list[type["BaseParser"]]:
+    for module in _BUILTIN_MODULES:
+        import_module(module)
+    return list(_PARSERS)
+
+
+def parser_for_name(name: str) -> type["BaseParser"]:
+    for parser_class in registered_parsers():
+        if parser_class.name == name:
+            return parser_class
+    raise ValueError(f"Unknown parser: {name}")
+
+
+def sniff(source: Source) -> Optional[type["BaseParser"]]:
+    """Returns the first registered parser that recognizes the source, if any."""
+    head = read_head(source, SNIFF_SIZE)
+
+    for parser_class in registered_parsers():
+        if parser_class.sniff(source, head):
+            return parser_class
+    return None
+
+
+def ingest(source: Source) -> "Statement":
+    """Parses a statement with the parser that recognizes its format."""
+    parser_class = sniff(source)
+    if parser_class is None:
+        name = source if is_path(source) else type(source).__name__
+        raise ValueError(f"Unrecognized statement format: {name}")
+    return parser_class().parse(source)
@@ -0,0 +1,106 @@
+"""
+Statement sources: the parsers read from paths, in-memory buffers (bytes,
+bytearray, memoryview, mmap) or binary file objects alike, so uploaded files
+never need to round-trip through the disk.
+"""
+
+import io
+import mmap
+import os
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, TextIO, TypeGuard, Union
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+Source = Union[str, "os.PathLike[str]", Buffer, BinaryIO]
+
+
+def is_path(source: Source) -> TypeGuard[Union[str, "os.PathLike[str]"]]:
+    return isinstance(source, (str, os.PathLike))
+
+
+@contextmanager
+def open_binary(source: Source) -> Iterator[BinaryIO]:
+    """
+    Yields a seekable binary stream over ``source``. Buffers are read in place
+    rather than copied; file objects are used as they are, from their current
+    position, and are left open.
+    """
+    if is_path(source):
+        with open(source, "rb") as infile:
+            yield infile
+    elif isinstance(source, bytes):
+        # BytesIO shares an immutable bytes object until it is written to.
+        yield io.BytesIO(source)
+    elif isinstance(source, (bytearray, memoryview, mmap.mmap)):
+        with memoryview(source) as view:
+            reader = io.BufferedReader(_MemoryReader(view.cast("B")))
+            try:
+                yield reader  # type: ignore[misc]
+            finally:
+                reader.detach()
+    else:
+        yield source  # type: ignore[misc]
+
+
+@contextmanager
+def open_text(source: Source, encoding: str = "utf-8") -> Iterator[TextIO]:
+    """Yields a text stream over ``source``, decoding it incrementally."""
+    if is_path(source):
+        with open(source, "r", encoding=encoding) as infile:
+            yield infile
+        return
+
+    with open_binary(source) as binary:
+        text = io.TextIOWrapper(binary, encoding=encoding)
+        try:
+            yield text
+        finally:
+            # Leaves the underlying stream open for the caller.
+            text.detach()
+
+
+def read_head(source: Source, size: int) -> bytes:
+    """Returns the first ``size`` bytes, restoring a file object's position."""
+    if is_path(source):
+        with open(source, "rb") as infile:
+            return infile.read(size)
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        with memoryview(source) as view:
+            return bytes(view.cast("B")[:size])
+
+    stream: BinaryIO = source  # type: ignore[assignment]
+    position = stream.tell()
+    try:
+        return stream.read(size)
+    finally:
+        stream.seek(position)
+
+
+class _MemoryReader(io.RawIOBase):
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[no-untyped-def]
+        chunk = self._view[self._position : self._position + len(buffer)]
+        size = len(chunk)
+        buffer[:size] = chunk
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
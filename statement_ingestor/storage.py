@@ -0,0 +1,173 @@
+"""
+Persistent transaction history in a single SQLite file.
+
+Transactions are keyed by their dedup fingerprint, so storing the same
+statement twice, or statements that overlap, keeps one row per transaction.
+The table is clustered on ``(account_id, date, fingerprint)`` (a WITHOUT ROWID
+table), which makes it its own covering index for account/date-window
+queries: they read one contiguous range of the B-tree and never the rest of
+the table.
+"""
+
+import json
+import sqlite3
+from datetime import date
+from typing import Iterator, Optional
+from statement_ingestor.dedup import fingerprints
+from statement_ingestor.models import (
+    AccountType,
+    Statement,
+    StatementBuilder,
+    Transaction,
+    to_cents,
+)
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS accounts ("
+    "account_id TEXT PRIMARY KEY, account_type TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS transactions ("
+    "account_id TEXT NOT NULL, date TEXT NOT NULL, fingerprint INTEGER NOT NULL, "
+    "description TEXT NOT NULL, amount_cents INTEGER NOT NULL, "
+    "currency TEXT NOT NULL, category TEXT, metadata TEXT, "
+    "PRIMARY KEY (account_id, date, fingerprint)) WITHOUT ROWID",
+    "CREATE UNIQUE INDEX IF NOT EXISTS transactions_fingerprint "
+    "ON transactions (fingerprint)",
+]
+
+_UPSERT = (
+    "INSERT INTO transactions (account_id, date, fingerprint, description, "
+    "amount_cents, currency, category, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (fingerprint) DO UPDATE SET description = excluded.description, "
+    "currency = excluded.currency, category = excluded.category, "
+    "metadata = excluded.metadata"
+)
+
+_SELECT = (
+    "SELECT date, description, amount_cents, currency, category, metadata "
+    "FROM transactions WHERE account_id = ? AND date BETWEEN ? AND ? "
+    "ORDER BY date, fingerprint"
+)
+
+
+class SQLiteStore:
+    """
+    Stores statements in the SQLite database at ``path``, in WAL mode so
+    readers are not blocked while a statement is being written.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+
+    def __getstate__(self) -> dict:
+        # Connections cannot cross process boundaries; workers reopen the file.
+        state = self.__dict__.copy()
+        state["_db"] = None
+        return state
+
+    def upsert(self, statement: Statement) -> int:
+        """
+        Inserts the statement's transactions, or updates the description,
+        currency, category and metadata of those already stored, in a single
+        transaction. Returns the number of transactions written.
+        """
+        db = self._connection()
+        account_ids = {t.account_id for t in statement.transactions}
+        with db:
+            db.executemany(
+                "INSERT INTO accounts (account_id, account_type) VALUES (?, ?) "
+                "ON CONFLICT (account_id) DO UPDATE "
+                "SET account_type = excluded.account_type",
+                [
+                    (account_id, statement.account_type.value)
+                    for account_id in account_ids
+                ],
+            )
+            cursor = db.executemany(_UPSERT, _rows(statement))
+        return cursor.rowcount
+
+    def query(
+        self,
+        account_id: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Statement:
+        """
+        Returns the stored transactions of an account dated within ``start``
+        and ``end``, inclusive, in date order.
+        """
+        db = self._connection()
+        row = db.execute(
+            "SELECT account_type FROM accounts WHERE account_id = ?", (account_id,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown account: {account_id}")
+
+        builder = StatementBuilder(account_id, AccountType(row[0]))
+        rows = db.execute(
+            _SELECT,
+            (
+                account_id,
+                start.isoformat() if start else "",
+                end.isoformat() if end else "9999-12-31",
+            ),
+        )
+        for day, description, cents, currency, category, metadata in rows:
+            builder.add(
+                Transaction(
+                    date.fromisoformat(day),
+                    description,
+                    cents / 100,
+                    currency,
+                    account_id,
+                    category,
+                    json.loads(metadata) if metadata is not None else None,
+                )
+            )
+        return builder.build()
+
+    def accounts(self) -> dict[str, AccountType]:
+        rows = self._connection().execute(
+            "SELECT account_id, account_type FROM accounts"
+        )
+        return {account_id: AccountType(value) for account_id, value in rows}
+
+    def __len__(self) -> int:
+        (count,) = (
+            self._connection().execute("SELECT COUNT(*) FROM transactions").fetchone()
+        )
+        return count
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            # With WAL, NORMAL only gives up durability of the last commits
+            # on power loss, never consistency, and avoids an fsync per commit.
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+        return self._db
+
+
+def _rows(statement: Statement) -> Iterator[tuple]:
+    for key, transaction in fingerprints(statement.transactions):
+        yield (
+            transaction.account_id,
+            transaction.date.isoformat(),
+            key,
+            transaction.description,
+            to_cents(transaction.amount),
+            transaction.currency,
+            transaction.category,
+            (
+                json.dumps(transaction.metadata)
+                if transaction.metadata is not None
+                else None
+            ),
+        )
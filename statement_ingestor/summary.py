@@ -0,0 +1,158 @@
+"""
+Precomputed monthly summaries of transactions, per account and category.
+
+``SummaryIndex`` keeps, for every account and month, the total, count,
+minimum and maximum amount in exact cents, both overall and per category.
+Statements are folded in as they are ingested, so answering "monthly spend
+of an account" reads one aggregate per month instead of every transaction.
+Aggregates only ever combine, so indexes built in parallel over disjoint
+statements merge into the index of all of them.
+"""
+
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, Optional, Union
+from statement_ingestor.models import Statement, Transaction, to_cents
+
+
+@dataclass
+class Aggregate:
+    total_cents: int = 0
+    count: int = 0
+    min_cents: Optional[int] = None
+    max_cents: Optional[int] = None
+
+    def add(self, cents: int) -> None:
+        self.total_cents += cents
+        self.count += 1
+        if self.min_cents is None or cents < self.min_cents:
+            self.min_cents = cents
+        if self.max_cents is None or cents > self.max_cents:
+            self.max_cents = cents
+
+    def merge(self, other: "Aggregate") -> None:
+        self.total_cents += other.total_cents
+        self.count += other.count
+        if other.min_cents is not None and (
+            self.min_cents is None or other.min_cents < self.min_cents
+        ):
+            self.min_cents = other.min_cents
+        if other.max_cents is not None and (
+            self.max_cents is None or other.max_cents > self.max_cents
+        ):
+            self.max_cents = other.max_cents
+
+
+class SummaryIndex:
+    """
+    Monthly aggregates per account (``monthly``) and per account and
+    category (``by_category``), with months as ``YYYY-MM``.
+
+    The index counts whatever it is given: adding the same statement twice
+    counts its transactions twice. Add each statement once, as it is first
+    ingested, or ``rebuild`` from the deduplicated history.
+    """
+
+    def __init__(self) -> None:
+        self._totals: defaultdict[str, dict[str, Aggregate]] = defaultdict(dict)
+        self._categories: defaultdict[
+            tuple[str, str], dict[Optional[str], Aggregate]
+        ] = defaultdict(dict)
+
+    @classmethod
+    def rebuild(
+        cls, statements: Iterable[Union[Statement, Iterable[Transaction]]]
+    ) -> "SummaryIndex":
+        """Builds an index from scratch over statements or transaction streams."""
+        index = cls()
+        for statement in statements:
+            index.add(statement)
+        return index
+
+    def add(self, statement: Union[Statement, Iterable[Transaction]]) -> None:
+        transactions = (
+            statement.transactions if isinstance(statement, Statement) else statement
+        )
+        totals, categories = self._totals, self._categories
+        for transaction in transactions:
+            day = transaction.date
+            month = f"{day.year:04d}-{day.month:02d}"
+            cents = to_cents(transaction.amount)
+            _aggregate(totals[transaction.account_id], month).add(cents)
+            _aggregate(
+                categories[transaction.account_id, month], transaction.category
+            ).add(cents)
+
+    def merge(self, other: "SummaryIndex") -> None:
+        """Folds in the aggregates of an index built over other statements."""
+        for account_id, months in other._totals.items():
+            for month, aggregate in months.items():
+                _aggregate(self._totals[account_id], month).merge(aggregate)
+        for key, categories in other._categories.items():
+            for category, aggregate in categories.items():
+                _aggregate(self._categories[key], category).merge(aggregate)
+
+    def accounts(self) -> list[str]:
+        return sorted(self._totals)
+
+    def monthly(
+        self,
+        account_id: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> dict[str, Aggregate]:
+        """
+        Returns the aggregates of an account per month, in month order, for
+        the months from ``start`` to ``end`` inclusive if given.
+        """
+        first = start.strftime("%Y-%m") if start else ""
+        last = end.strftime("%Y-%m") if end else "9999-12"
+        months = self._totals.get(account_id, {})
+        return {
+            month: months[month] for month in sorted(months) if first <= month <= last
+        }
+
+    def by_category(
+        self, account_id: str, month: str
+    ) -> dict[Optional[str], Aggregate]:
+        """Returns the aggregates of an account's month per category."""
+        return dict(self._categories.get((account_id, month), {}))
+
+    def save(self, path: str) -> None:
+        rows = [
+            [account_id, month, category, *_fields(aggregate)]
+            for (account_id, month), categories in self._categories.items()
+            for category, aggregate in categories.items()
+        ]
+        with open(path, "w", encoding="utf-8") as outfile:
+            json.dump(rows, outfile)
+
+    @classmethod
+    def load(cls, path: str) -> "SummaryIndex":
+        # Only the per-category aggregates are stored; the account totals are
+        # their merge.
+        index = cls()
+        with open(path, "r", encoding="utf-8") as infile:
+            for account_id, month, category, *fields in json.load(infile):
+                aggregate = Aggregate(*fields)
+                index._categories[account_id, month][category] = aggregate
+                _aggregate(index._totals[account_id], month).merge(aggregate)
+        return index
+
+
+def _aggregate(aggregates: dict, key: Optional[str]) -> Aggregate:
+    aggregate = aggregates.get(key)
+    if aggregate is None:
+        aggregate = aggregates[key] = Aggregate()
+    return aggregate
+
+
+def _fields(aggregate: Aggregate) -> list[Optional[int]]:
+    return [
+        aggregate.total_cents,
+        aggregate.count,
+        aggregate.min_cents,
+        aggregate.max_cents,
+    ]
@@ -1,3 +1,32 @@
 # SPDX-FileCopyrightText: 2025-present Raphael Santana <uroboros.phael@gmail.com>
 #
 # SPDX-License-Identifier: MIT
+
+from datetime import date
+from typing import Any, Optional
+from statement_ingestor.models import AccountType, Statement, Transaction
+
+
+def make_transaction(
+    day: date,
+    amount: float = 10.0,
+    description: str = "Compra",
+    account_id: str = "nubank_card_0000",
+    **fields: Any,
+) -> Transaction:
+    """A BRL transaction for tests; ``fields`` sets category or metadata."""
+    return Transaction(day, description, amount, "BRL", account_id, **fields)
+
+
+def make_statement(
+    *transactions: Transaction,
+    account_id: str = "nubank_card_0000",
+    account_type: AccountType = AccountType.CREDIT_CARD,
+    due_date: Optional[date] = None,
+) -> Statement:
+    return Statement(
+        account_id=account_id,
+        account_type=account_type,
+        transactions=list(transactions),
+        due_date=due_date,
+    )
@@ -0,0 +1,104 @@
+import asyncio
+import io
+import threading
+import time
+from statement_ingestor import NubankCreditCardParser
+from statement_ingestor.aio import AsyncParser
+
+CARD_SAMPLE = "anonymous_samples/nubank_card_statement.csv"
+
+
+class _SlowParser(NubankCreditCardParser):
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def parse(self, file_path):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.01)
+        with self.lock:
+            self.running -= 1
+        return super().parse(file_path)
+
+
+def test_aparse_accepts_paths_bytes_and_file_objects():
+    with open(CARD_SAMPLE, "rb") as infile:
+        content = infile.read()
+    expected = NubankCreditCardParser().parse(CARD_SAMPLE)
+    parser = AsyncParser(NubankCreditCardParser())
+
+    async def run():
+        return await asyncio.gather(
+            parser.aparse(CARD_SAMPLE),
+            parser.aparse(content),
+            parser.aparse(io.BytesIO(content)),
+        )
+
+    assert asyncio.run(run()) == [expected, expected, expected]
+
+
+def test_aparse_bounds_concurrency():
+    slow_parser = _SlowParser()
+    parser = AsyncParser(slow_parser, max_concurrency=2)
+
+    async def run():
+        return await asyncio.gather(*(parser.aparse(CARD_SAMPLE) for _ in range(8)))
+
+    assert len(asyncio.run(run())) == 8
+    assert slow_parser.peak <= 2
+
+
+def test_aiter_transactions_streams_in_batches():
+    parser = AsyncParser(NubankCreditCardParser())
+
+    async def run():
+        return [t async for t in parser.aiter_transactions(CARD_SAMPLE, batch_size=3)]
+
+    assert (
+        asyncio.run(run()) == NubankCreditCardParser().parse(CARD_SAMPLE).transactions
+    )
+
+
+class _EagerParser(NubankCreditCardParser):
+    def iter_transactions(self, file_path):
+        # Extracts everything before returning, like a non-generator parser.
+        time.sleep(0.2)
+        return iter(list(super().iter_transactions(file_path)))
+
+
+def test_aiter_transactions_does_not_block_the_loop_while_opening():
+    parser = AsyncParser(_EagerParser())
+
+    async def tick(ticks, stop):
+        while not stop.is_set():
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def run():
+        ticks, stop = [], asyncio.Event()
+        ticker = asyncio.create_task(tick(ticks, stop))
+        transactions = [t async for t in parser.aiter_transactions(CARD_SAMPLE)]
+        stop.set()
+        await ticker
+        return transactions, ticks
+
+    transactions, ticks = asyncio.run(run())
+    assert len(transactions) == 10
+    assert len(ticks) >= 5
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.15
+
+
+def test_aparse_many_isolates_failures(tmp_path):
+    slow_parser = _SlowParser()
+    parser = AsyncParser(slow_parser, max_concurrency=2)
+    sources = [CARD_SAMPLE, str(tmp_path / "missing.csv"), CARD_SAMPLE, CARD_SAMPLE]
+
+    async def run():
+        return [result async for result in parser.aparse_many(sources)]
+
+    results = asyncio.run(run())
+    assert sorted(r.ok for r in results) == [False, True, True, True]
+    assert slow_parser.peak <= 2
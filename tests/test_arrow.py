@@ -0,0 +1,75 @@
+import pytest
+from datetime import date
+
+pa = pytest.importorskip("pyarrow")
+
+from statement_ingestor import NubankBankParser
+from statement_ingestor.arrow import (
+    SCHEMA,
+    read_parquet_dataset,
+    record_batches,
+    to_table,
+    write_parquet_dataset,
+)
+from statement_ingestor.models import Transaction
+
+BANK_SAMPLE = "anonymous_samples/nubank_bank_statement.csv"
+
+TRANSACTIONS = [
+    Transaction(date(2024, 1, 5), "Mercado", -12.34, "BRL", "bank", "food"),
+    Transaction(date(2024, 1, 20), "Salario", 5000.0, "BRL", "bank"),
+    Transaction(date(2024, 2, 1), "Loja", -0.1, "BRL", "card"),
+]
+
+
+def test_record_batches_are_typed_and_bounded():
+    batches = list(record_batches(iter(TRANSACTIONS), batch_size=2))
+
+    assert [batch.num_rows for batch in batches] == [2, 1]
+    assert all(batch.schema == SCHEMA for batch in batches)
+    assert pa.Table.from_batches(batches).to_pylist()[:2] == [
+        {
+            "date": date(2024, 1, 5),
+            "description": "Mercado",
+            "amount_cents": -1234,
+            "currency": "BRL",
+            "account_id": "bank",
+            "category": "food",
+        },
+        {
+            "date": date(2024, 1, 20),
+            "description": "Salario",
+            "amount_cents": 500000,
+            "currency": "BRL",
+            "account_id": "bank",
+            "category": None,
+        },
+    ]
+
+
+def test_transaction_table_matches_row_conversion():
+    pytest.importorskip("numpy")
+    from statement_ingestor.columnar import TransactionTable
+
+    table = TransactionTable.from_transactions(TRANSACTIONS)
+
+    assert to_table(table).equals(to_table(TRANSACTIONS))
+
+
+def test_write_parquet_dataset_partitions_by_account_and_month(tmp_path):
+    root = tmp_path / "dataset"
+    statement = NubankBankParser().parse(BANK_SAMPLE)
+
+    write_parquet_dataset(TRANSACTIONS, str(root))
+    write_parquet_dataset(statement, str(root), batch_size=4)
+
+    assert sorted(path.name for path in (root / "account_id=bank").iterdir()) == [
+        "month=2024-01"
+    ]
+    assert len(list((root / "account_id=bank" / "month=2024-01").iterdir())) == 1
+    table = read_parquet_dataset(str(root))
+    assert table.num_rows == len(TRANSACTIONS) + len(statement.transactions)
+    card = table.filter(pa.compute.equal(table["account_id"], "card"))
+    assert card.select(["month", "amount_cents"]).to_pylist() == [
+        {"month": "2024-02", "amount_cents": -10}
+    ]
@@ -0,0 +1,43 @@
+from statement_ingestor import NubankCreditCardParser, ingest_many
+from statement_ingestor.cli import main
+
+CARD_SAMPLE = "anonymous_samples/nubank_card_statement.csv"
+
+
+def test_ingest_many_in_order(tmp_path):
+    missing = str(tmp_path / "missing.csv")
+    paths = [CARD_SAMPLE, missing, CARD_SAMPLE]
+
+    results = list(ingest_many(paths, NubankCreditCardParser(), workers=2))
+
+    assert [r.path for r in results] == paths
+    assert [r.ok for r in results] == [True, False, True]
+    assert len(results[0].statement.transactions) == 10
+    assert results[1].statement is None
+    assert results[1].error.startswith("FileNotFoundError")
+    assert all(r.elapsed >= 0 for r in results)
+
+
+def test_ingest_many_unordered_single_worker():
+    paths = [CARD_SAMPLE] * 5
+
+    results = list(
+        ingest_many(paths, NubankCreditCardParser(), workers=1, ordered=False)
+    )
+
+    assert len(results) == 5
+    assert all(r.ok for r in results)
+
+
+def test_cli_batch(tmp_path, capsys):
+    missing = str(tmp_path / "missing.csv")
+
+    exit_code = main(
+        ["batch", "--parser", "nubank-card", "--workers", "1", CARD_SAMPLE, missing]
+    )
+
+    lines = capsys.readouterr().out.splitlines()
+    assert exit_code == 1
+    assert lines[0].startswith(CARD_SAMPLE)
+    assert lines[0].endswith("10 transactions")
+    assert "error: FileNotFoundError" in lines[1]
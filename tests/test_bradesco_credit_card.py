@@ -1,13 +1,26 @@
+import pytest
 from unittest.mock import patch, MagicMock
 from statement_ingestor import BradescoCreditCardParser
 from statement_ingestor.bradesco_credit_card_parser import (
+    ColumnLayout,
+    PageAction,
+    skip_pages_without_transactions,
+    stop_after_marker,
+    stop_after_pages,
+    _LineKind,
+    _classify_line,
+    _parse_amount_cents,
     _extract_card_number,
     _is_transaction_line,
     _parse_transaction,
     _extract_statement_lines,
 )
+from statement_ingestor.cache import CachingParser, DiskCache
+from statement_ingestor.metrics import Metrics
 from statement_ingestor.models import AccountType, Statement, Transaction
 from datetime import datetime, date
+from pdfplumber.page import Page
+from benchmarks.pdf_factory import build_pdf
 
 
 def test_ingest_statement():
@@ -141,3 +154,227 @@ def test_parse_transaction_year_boundary():
         account_id="test_account_id",
     )
     assert _parse_transaction(line, "test_account_id", due_date) == expected
+
+
+def test_parse_pdf_with_page_workers(tmp_path):
+    pages = [
+        ["VENCIMENTO 01/04/2025", "JOHN DOE Cartão 4066 XXXX XXXX 1234"],
+        ["06/03 PAG BOLETO BANCARIO 1.234,56-", "07/03 COMPRA TESTE 100,00"],
+        ["JOHN DOE Cartão 4066 XXXX XXXX 5678"],
+        ["08/03 OUTRA COMPRA 50,00"],
+    ]
+    pdf_file = tmp_path / "statement.pdf"
+    pdf_file.write_bytes(build_pdf(pages))
+
+    serial = BradescoCreditCardParser().parse(str(pdf_file))
+    parallel = BradescoCreditCardParser(workers=3).parse(str(pdf_file))
+
+    assert list(_extract_statement_lines(str(pdf_file), workers=3)) == [
+        line for page in pages for line in page
+    ]
+    assert parallel == serial
+    assert [t.account_id for t in parallel.transactions] == [
+        "bradesco_credit_card_1234",
+        "bradesco_credit_card_1234",
+        "bradesco_credit_card_5678",
+    ]
+
+
+def test_line_cache_skips_pdf_extraction(tmp_path):
+    pdf_file = tmp_path / "statement.pdf"
+    pdf_file.write_bytes(
+        build_pdf(
+            [
+                ["VENCIMENTO 01/04/2025", "JOHN DOE Cartão 4066 XXXX XXXX 1234"],
+                ["06/03 PAG BOLETO BANCARIO 1.234,56-"],
+            ]
+        )
+    )
+    line_cache = DiskCache(str(tmp_path / "lines.sqlite"))
+    parser = BradescoCreditCardParser(line_cache=line_cache)
+
+    first = parser.parse(str(pdf_file))
+    with patch("statement_ingestor.bradesco_credit_card_parser._iter_pages") as extract:
+        second = parser.parse(str(pdf_file))
+
+    extract.assert_not_called()
+    assert second == first
+    assert len(second.transactions) == 1
+    assert (line_cache.hits, line_cache.misses) == (1, 1)
+
+
+def test_classify_line():
+    kind, match = _classify_line("06/03 PAG BOLETO BANCARIO 1.234,56-")
+    assert kind is _LineKind.TRANSACTION
+    assert match.group("description", "amount") == ("PAG BOLETO BANCARIO", "1.234,56-")
+
+    kind, match = _classify_line("JOHN DOE Cartão 4066 XXXX XXXX 1234")
+    assert kind is _LineKind.HEADER
+    assert match.group(1) == "1234"
+
+    kind, match = _classify_line("Vencimento 01/04/2025")
+    assert kind is _LineKind.DUE_DATE
+    assert match.group(0) == "01/04/2025"
+
+    assert _classify_line("VISA INFINITE") == (_LineKind.NOISE, None)
+
+
+def test_transactions_before_due_date_line_use_due_date():
+    lines = [
+        "JOHN DOE Cartão 4066 XXXX XXXX 1234",
+        "28/12 COMPRA DE NATAL 150,00",
+        "VENCIMENTO 15/01/2024",
+        "02/01 COMPRA DE ANO NOVO 20,00",
+    ]
+
+    with patch(
+        "statement_ingestor.bradesco_credit_card_parser._extract_statement_lines",
+        return_value=lines,
+    ):
+        statement = BradescoCreditCardParser().parse("dummy.pdf")
+
+    assert [t.date for t in statement.transactions] == [
+        date(2023, 12, 28),
+        date(2024, 1, 2),
+    ]
+
+
+def test_invalid_transaction_lines_raise_unless_skipped():
+    lines = ["VENCIMENTO 01/04/2025", "31/02 DATA INVALIDA 2,00", "07/03 OUTRA 3,00"]
+
+    with patch(
+        "statement_ingestor.bradesco_credit_card_parser._extract_statement_lines",
+        return_value=lines,
+    ):
+        with pytest.raises(ValueError, match="31/02 DATA INVALIDA"):
+            BradescoCreditCardParser().parse("dummy.pdf")
+        with pytest.raises(ValueError, match="31/02 DATA INVALIDA"):
+            BradescoCreditCardParser(metrics=Metrics()).parse("dummy.pdf")
+        statement = BradescoCreditCardParser(skip_invalid=True).parse("dummy.pdf")
+
+    assert [t.description for t in statement.transactions] == ["OUTRA"]
+
+
+def test_parse_amount_cents():
+    assert _parse_amount_cents("8.804,23-") == -880423
+    assert _parse_amount_cents("117,50") == 11750
+    assert _parse_amount_cents("1.234") == 123400
+
+
+def _write_statement_pdf(tmp_path, pages):
+    pdf_file = tmp_path / "statement.pdf"
+    pdf_file.write_bytes(build_pdf(pages))
+    return str(pdf_file)
+
+
+def test_extract_due_date_reads_only_the_first_page(tmp_path):
+    pdf_file = _write_statement_pdf(
+        tmp_path,
+        [["VENCIMENTO 01/04/2025"], ["06/03 COMPRA 1,00"], ["07/03 COMPRA 2,00"]],
+    )
+    parser = BradescoCreditCardParser()
+
+    with patch.object(
+        Page, "extract_text", autospec=True, side_effect=Page.extract_text
+    ) as extract_text:
+        assert parser.extract_due_date(pdf_file) == date(2025, 4, 1)
+
+    assert extract_text.call_count == 1
+    assert len(parser.parse(pdf_file).transactions) == 2
+
+
+def test_page_rules_stop_and_skip(tmp_path):
+    pdf_file = _write_statement_pdf(
+        tmp_path,
+        [
+            ["VENCIMENTO 01/04/2025", "JOHN DOE Cartão 4066 XXXX XXXX 1234"],
+            ["Programa de fidelidade"],
+            ["06/03 COMPRA 1,00", "Total da fatura 1,00"],
+            ["01/01 TERMOS E CONDICOES 99,99"],
+        ],
+    )
+    pages_seen = []
+
+    def record(page_number, lines):
+        pages_seen.append(page_number)
+        return PageAction.PARSE
+
+    parser = BradescoCreditCardParser(
+        page_rules=[
+            record,
+            skip_pages_without_transactions,
+            stop_after_marker("Total da fatura"),
+        ]
+    )
+    statement = parser.parse(pdf_file)
+
+    assert [t.description for t in statement.transactions] == ["COMPRA"]
+    assert statement.transactions[0].account_id == "bradesco_credit_card_1234"
+    assert pages_seen == [0, 1, 2]
+    assert list(
+        _extract_statement_lines(pdf_file, page_rules=[stop_after_pages(1)])
+    ) == ["VENCIMENTO 01/04/2025", "JOHN DOE Cartão 4066 XXXX XXXX 1234"]
+
+
+def test_column_layout_drops_text_right_of_amount(tmp_path):
+    pdf_file = _write_statement_pdf(
+        tmp_path,
+        [
+            [
+                "VENCIMENTO 01/04/2025",
+                "JOHN DOE Cartão 4066 XXXX XXXX 1234",
+                [(40, "06/03"), (80, "PADARIA CENTRAL"), (400, "12,50")],
+                [(40, "07/03"), (80, "LOJA"), (400, "100,00"), (460, "+ 100 pontos")],
+            ]
+        ],
+    )
+    layout = ColumnLayout(description_x0=75, amount_x0=380, amount_x1=450)
+
+    statement = BradescoCreditCardParser(column_layout=layout).parse(pdf_file)
+
+    assert [(t.description, t.amount) for t in statement.transactions] == [
+        ("PADARIA CENTRAL", 12.5),
+        ("LOJA", 100.0),
+    ]
+    assert statement.transactions[0].account_id == "bradesco_credit_card_1234"
+    assert statement.transactions[0].date == date(2025, 3, 6)
+
+
+def test_parser_options_are_part_of_the_cache_key(tmp_path):
+    pdf_file = _write_statement_pdf(
+        tmp_path,
+        [["VENCIMENTO 01/04/2025", "JOHN DOE Cartão 4066 XXXX XXXX 1234"]],
+    )
+    cache = DiskCache(tmp_path / "cache.sqlite")
+    layout = ColumnLayout(description_x0=75, amount_x0=380, amount_x1=450)
+
+    CachingParser(BradescoCreditCardParser(), cache).parse(pdf_file)
+    CachingParser(BradescoCreditCardParser(column_layout=layout), cache).parse(pdf_file)
+    CachingParser(
+        BradescoCreditCardParser(page_rules=[stop_after_pages(1)]), cache
+    ).parse(pdf_file)
+    CachingParser(
+        BradescoCreditCardParser(page_rules=[stop_after_pages(1)]), cache
+    ).parse(pdf_file)
+
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_rules_without_a_stable_token_are_not_cached(tmp_path):
+    pdf_file = _write_statement_pdf(
+        tmp_path,
+        [
+            ["VENCIMENTO 01/04/2025", "06/03 COMPRA 1,00"],
+            ["07/03 OUTRA 3,00"],
+        ],
+    )
+    cache = DiskCache(tmp_path / "cache.sqlite")
+    parse_all = BradescoCreditCardParser(page_rules=[lambda n, lines: PageAction.PARSE])
+    first_page = BradescoCreditCardParser(page_rules=[lambda n, lines: PageAction.LAST])
+
+    assert len(CachingParser(parse_all, cache).parse(pdf_file).transactions) == 2
+    assert len(CachingParser(first_page, cache).parse(pdf_file).transactions) == 1
+    assert first_page.cache_token() is None
+    assert (cache.hits, cache.misses) == (0, 0)
+    named_rule = BradescoCreditCardParser(page_rules=[skip_pages_without_transactions])
+    assert "skip_pages_without_transactions" in named_rule.cache_token()
@@ -0,0 +1,57 @@
+import shutil
+from unittest.mock import patch
+from statement_ingestor import NubankCreditCardParser
+from statement_ingestor.cache import CachingParser, DiskCache
+
+CARD_SAMPLE = "anonymous_samples/nubank_card_statement.csv"
+
+
+def test_caching_parser_serves_repeat_parses_from_cache(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+    parser = CachingParser(NubankCreditCardParser(), cache)
+
+    first = parser.parse(CARD_SAMPLE)
+    with patch.object(NubankCreditCardParser, "parse") as parse:
+        second = parser.parse(CARD_SAMPLE)
+
+    parse.assert_not_called()
+    assert second == first == NubankCreditCardParser().parse(CARD_SAMPLE)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_caching_parser_keys_on_content(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+    parser = CachingParser(NubankCreditCardParser(), cache)
+    statement_file = tmp_path / "statement.csv"
+    shutil.copy(CARD_SAMPLE, statement_file)
+
+    parser.parse(str(statement_file))
+    statement_file.write_text("date,title,amount\n2024-02-01,Padaria,12.00\n")
+    statement = parser.parse(str(statement_file))
+
+    assert len(statement.transactions) == 1
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_caching_parser_ignores_entries_of_an_older_statement_format(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+    parser = CachingParser(NubankCreditCardParser(), cache)
+
+    with patch("statement_ingestor.cache.STATEMENT_FORMAT", 1):
+        parser.parse(CARD_SAMPLE)
+    parser.parse(CARD_SAMPLE)
+
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), max_bytes=20)
+    cache.put("a", b"x" * 8)
+    cache.put("b", b"x" * 8)
+    assert cache.get("a") is not None
+
+    cache.put("c", b"x" * 8)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"x" * 8
+    assert cache.get("c") == b"x" * 8
@@ -0,0 +1,83 @@
+import pytest
+from datetime import date
+from statement_ingestor import NubankCreditCardParser
+from statement_ingestor.categorize import Categorizer, Rule
+from statement_ingestor.models import AccountType, Statement, Transaction
+
+CARD_SAMPLE = "anonymous_samples/nubank_card_statement.csv"
+
+RULES = [
+    Rule("groceries", keyword="pão de açúcar"),
+    Rule("food", pattern=r"padaria|restaurante"),
+    Rule("transport", keyword="uber"),
+    Rule("transfer", keyword="pix"),
+]
+
+
+def test_categorize_folds_accents_and_case():
+    categorizer = Categorizer(RULES, default="other")
+
+    assert categorizer.categorize("PAO DE ACUCAR-1783 R. DE JANEIRO") == "groceries"
+    assert categorizer.categorize("Uber* Trip") == "transport"
+    assert categorizer.categorize("Restaurante Sabor") == "food"
+    assert categorizer.categorize("Netflix") == "other"
+
+
+def test_first_listed_rule_wins():
+    categorizer = Categorizer(RULES)
+
+    # "pix" occurs first in the text, but the padaria rule is listed first.
+    assert categorizer.categorize("Pix para Padaria Pão Quente") == "food"
+    assert categorizer.categorize("Pix Uber") == "transport"
+
+
+def test_overlapping_keywords():
+    categorizer = Categorizer(
+        [Rule("a", keyword="hers"), Rule("b", keyword="she"), Rule("c", keyword="he")]
+    )
+
+    assert categorizer.categorize("ushers") == "a"
+    assert categorizer.categorize("ushe") == "b"
+    assert categorizer.categorize("ahe") == "c"
+    assert categorizer.categorize("hr") is None
+
+
+def test_apply_fills_missing_categories_once_per_description():
+    categorizer = Categorizer(RULES)
+    statement = Statement(
+        account_id="card",
+        account_type=AccountType.CREDIT_CARD,
+        transactions=[
+            Transaction(date(2025, 3, 1), "Uber* Trip", 10.0, "BRL", "card"),
+            Transaction(date(2025, 3, 2), "Uber* Trip", 12.0, "BRL", "card"),
+            Transaction(date(2025, 3, 3), "Uber* Trip", 9.0, "BRL", "card", "work"),
+        ],
+    )
+
+    assert categorizer.apply(statement) is statement
+    assert [t.category for t in statement.transactions] == [
+        "transport",
+        "transport",
+        "work",
+    ]
+    assert len(categorizer._memo) == 1
+
+
+def test_iter_categorized_streams_parser_output():
+    categorizer = Categorizer(RULES, default="other")
+    parser = NubankCreditCardParser()
+
+    transactions = list(
+        categorizer.iter_categorized(parser.iter_transactions(CARD_SAMPLE))
+    )
+
+    assert transactions[0].description == "Uber* Trip"
+    assert transactions[0].category == "transport"
+    assert all(t.category is not None for t in transactions)
+
+
+def test_rule_needs_keyword_or_pattern():
+    with pytest.raises(ValueError):
+        Rule("food")
+    with pytest.raises(ValueError):
+        Rule("food", keyword="padaria", pattern="padaria")
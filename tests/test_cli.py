@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+import subprocess
+import sys
+from statement_ingestor.cli import main
+
+CARD_SAMPLE = "anonymous_samples/nubank_card_statement.csv"
+
+
+def test_parse_streams_ndjson_for_globbed_inputs(capsys):
+    exit_code = main(["parse", "anonymous_samples/nubank_*_statement.csv"])
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert exit_code == 0
+    assert {record["source"] for record in records} == {
+        "anonymous_samples/nubank_bank_statement.csv",
+        CARD_SAMPLE,
+    }
+    card = [record for record in records if record["source"] == CARD_SAMPLE]
+    assert card[0] == {
+        "source": CARD_SAMPLE,
+        "date": "2024-01-01",
+        "description": "Uber* Trip",
+        "amount": 15.5,
+        "currency": "BRL",
+        "account_id": "nubank_card_0000",
+    }
+
+
+def test_parse_csv_reports_failures(tmp_path, capsys):
+    missing = str(tmp_path / "missing.csv")
+
+    exit_code = main(["parse", "--format", "csv", CARD_SAMPLE, missing])
+
+    output = capsys.readouterr()
+    rows = list(csv.DictReader(io.StringIO(output.out)))
+    assert exit_code == 1
+    assert len(rows) == 10
+    assert rows[1]["description"] == "Spotify"
+    assert output.err.startswith(f"{missing}: ")
+
+
+def test_importing_a_nubank_parser_does_not_import_pdfplumber():
+    code = (
+        "import sys, statement_ingestor\n"
+        "from statement_ingestor import NubankBankParser, sniff\n"
+        f"sniff({CARD_SAMPLE!r})\n"
+        "assert 'pdfplumber' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_parse_continues_past_a_corrupt_file(tmp_path, capsys):
+    corrupt = tmp_path / "corrupt.pdf"
+    corrupt.write_bytes(b"%PDF-1.4\nnot really a pdf")
+    bank_sample = "anonymous_samples/nubank_bank_statement.csv"
+
+    exit_code = main(["parse", CARD_SAMPLE, str(corrupt), bank_sample])
+
+    output = capsys.readouterr()
+    sources = {json.loads(line)["source"] for line in output.out.splitlines()}
+    assert exit_code == 1
+    assert sources == {CARD_SAMPLE, bank_sample}
+    assert output.err.startswith(f"{corrupt}: ")
+
+
+def test_parse_reports_a_forced_parser_that_does_not_fit(capsys):
+    exit_code = main(["parse", "--parser", "nubank-bank", CARD_SAMPLE])
+
+    assert exit_code == 1
+    assert capsys.readouterr().err.startswith(f"{CARD_SAMPLE}: ")
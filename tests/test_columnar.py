@@ -0,0 +1,52 @@
+import pytest
+from datetime import date
+from statement_ingestor import NubankBankParser
+
+np = pytest.importorskip("numpy")
+
+from statement_ingestor.columnar import TransactionTable
+from tests import make_transaction
+
+BANK_SAMPLE = "anonymous_samples/nubank_bank_statement.csv"
+
+
+def test_parse_table_round_trips_transactions():
+    parser = NubankBankParser()
+
+    table = parser.parse_table(BANK_SAMPLE)
+
+    assert len(table) == 10
+    assert table.dates.dtype == np.dtype("datetime64[D]")
+    assert table.amounts.dtype == np.int64
+    assert list(table) == parser.parse(BANK_SAMPLE).transactions
+
+
+def test_slicing_shares_memory():
+    table = NubankBankParser().parse_table(BANK_SAMPLE)
+
+    window = table[2:5]
+
+    assert len(window) == 3
+    assert np.shares_memory(window.amounts, table.amounts)
+    assert window[0] == table[2]
+
+
+def test_filters_and_aggregations():
+    table = TransactionTable.from_transactions(
+        [
+            make_transaction(date(2024, 1, 5), 10.10, account_id="a"),
+            make_transaction(date(2024, 1, 20), 0.20, account_id="b"),
+            make_transaction(date(2024, 2, 1), -3.00, account_id="a"),
+        ]
+    )
+
+    assert table.sum_by_account() == {"a": 710, "b": 20}
+    assert table.sum_by_month() == {"2024-01": 1030, "2024-02": -300}
+
+    january_a = table.filter(
+        table.account_mask("a") & table.date_mask(end=date(2024, 1, 31))
+    )
+    assert list(january_a) == [
+        make_transaction(date(2024, 1, 5), 10.10, account_id="a")
+    ]
+    assert len(table.filter(table.account_mask("missing"))) == 0
@@ -0,0 +1,105 @@
+from datetime import date
+from statement_ingestor.dedup import BloomFilter, DedupIndex, fingerprint
+from statement_ingestor.normalize import normalize_description
+from tests import make_statement, make_transaction
+
+
+def test_normalize_description():
+    assert normalize_description("Padaria  Pão de Ouro ") == "padaria pao de ouro"
+
+
+def test_fingerprint_ignores_description_formatting():
+    assert fingerprint(
+        make_transaction(date(2024, 1, 1), 10.0, "Farmácia Droga Raia")
+    ) == fingerprint(make_transaction(date(2024, 1, 1), 10.0, "FARMACIA DROGA  RAIA"))
+    assert fingerprint(make_transaction(date(2024, 1, 1), 10.0, "Uber")) != fingerprint(
+        make_transaction(date(2024, 1, 1), 10.01, "Uber")
+    )
+
+
+def test_merge_keeps_only_new_transactions():
+    index = DedupIndex()
+    coffee = make_transaction(date(2024, 1, 2), 5.0, "Café")
+    first = index.merge(
+        make_statement(make_transaction(date(2024, 1, 1), 10.0, "Uber"), coffee, coffee)
+    )
+
+    second = index.merge(
+        make_statement(
+            coffee, coffee, coffee, make_transaction(date(2024, 1, 3), 20.0, "Spotify")
+        )
+    )
+
+    assert len(first.transactions) == 3
+    assert second.transactions == [
+        coffee,
+        make_transaction(date(2024, 1, 3), 20.0, "Spotify"),
+    ]
+    assert second.start_date == date(2024, 1, 2)
+    assert len(index) == 5
+
+
+def test_index_persists_between_runs(tmp_path):
+    directory = str(tmp_path / "dedup")
+    index = DedupIndex(directory)
+    index.merge(make_statement(make_transaction(date(2024, 1, 1), 10.0, "Uber")))
+    index.save()
+    index.close()
+
+    reopened = DedupIndex(directory)
+    merged = reopened.merge(
+        make_statement(
+            make_transaction(date(2024, 1, 1), 10.0, "Uber"),
+            make_transaction(date(2024, 1, 2), 3.0, "Pão"),
+        )
+    )
+    reopened.save()
+
+    assert [t.description for t in merged.transactions] == ["Pão"]
+    assert len(DedupIndex(directory, use_bloom=False)) == 2
+
+
+def test_stale_or_truncated_bloom_filter_is_rebuilt(tmp_path):
+    directory = tmp_path / "dedup"
+    index = DedupIndex(str(directory))
+    index.merge(make_statement(make_transaction(date(2024, 1, 1), 10.0, "Uber")))
+    index.save()
+    stale = (directory / "bloom.bin").read_bytes()
+    index.merge(make_statement(make_transaction(date(2024, 1, 2), 3.0, "Pão")))
+    index.save()
+    index.close()
+
+    # As if the save had stopped between the fingerprints and the filter.
+    (directory / "bloom.bin").write_bytes(stale)
+    reopened = DedupIndex(str(directory))
+    assert (
+        reopened.merge(
+            make_statement(make_transaction(date(2024, 1, 2), 3.0, "Pão"))
+        ).transactions
+        == []
+    )
+    reopened.close()
+
+    (directory / "bloom.bin").write_bytes(stale[:40])
+    reopened = DedupIndex(str(directory))
+    assert (
+        reopened.merge(
+            make_statement(make_transaction(date(2024, 1, 1), 10.0, "Uber"))
+        ).transactions
+        == []
+    )
+    assert not list(directory.glob("*.tmp"))
+
+
+def test_bloom_filter_round_trip(tmp_path):
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for value in range(0, 2000, 2):
+        bloom.add(value * 7919)
+    path = str(tmp_path / "bloom.bin")
+    bloom.save(path)
+
+    loaded = BloomFilter.load(path)
+
+    assert all(value * 7919 in loaded for value in range(0, 2000, 2))
+    false_positives = sum(value * 7919 in loaded for value in range(1, 2000, 2))
+    assert false_positives < 50
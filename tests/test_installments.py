@@ -0,0 +1,98 @@
+from datetime import date
+from statement_ingestor import BradescoCreditCardParser
+from statement_ingestor.bradesco_credit_card_parser import _parse_lines
+from statement_ingestor.installments import InstallmentTracker, parse_installment
+from statement_ingestor.models import Statement
+from benchmarks.pdf_factory import build_pdf
+from tests import make_statement, make_transaction
+
+
+def test_parse_installment():
+    assert parse_installment("LOJA X 03/10") == ("LOJA X", 3, 10)
+    assert parse_installment("LOJA X") is None
+    assert parse_installment("LOJA X 11/10") is None
+    assert parse_installment("LOJA X 01/01") is None
+
+
+def test_bradesco_lines_keep_installment_suffix():
+    lines = ["VENCIMENTO 10/04/2025", "07/03 LOJA X 03/10 150,00"]
+
+    (transaction,) = _parse_lines(lines)
+
+    assert transaction.description == "LOJA X 03/10"
+    assert transaction.amount == 150.0
+    assert transaction.metadata == {"installment": 3, "installments": 10}
+
+
+def test_bradesco_statement_has_due_date(tmp_path):
+    pdf_file = tmp_path / "statement.pdf"
+    pdf_file.write_bytes(
+        build_pdf(
+            [
+                [
+                    "JOHN DOE Cartão 4066 XXXX XXXX 1234",
+                    "07/03 LOJA X 03/10 150,00",
+                    "VENCIMENTO 10/04/2025",
+                ]
+            ]
+        )
+    )
+
+    statement = BradescoCreditCardParser().parse(str(pdf_file))
+
+    assert statement.due_date == date(2025, 4, 10)
+    assert statement.transactions[0].date == date(2025, 3, 7)
+
+
+def _card_statement(due_date: date, *descriptions: tuple[str, float]) -> Statement:
+    return make_statement(
+        *(
+            make_transaction(due_date, amount, description, "card_1234")
+            for description, amount in descriptions
+        ),
+        due_date=due_date,
+    )
+
+
+def test_tracker_links_installments_and_projects_bills(tmp_path):
+    tracker = InstallmentTracker()
+
+    tracker.add(
+        _card_statement(
+            date(2025, 4, 10),
+            ("LOJA X 03/04", 150.0),
+            ("Loja Y 01/02", 20.0),
+            ("PADARIA", 5.0),
+        )
+    )
+    assert tracker.projection() == {"2025-05": 17000}
+
+    updated = tracker.add(
+        _card_statement(
+            date(2025, 5, 10),
+            ("LOJA X 04/04", 150.0),
+            ("LOJA Y 02/02", 20.0),
+            ("LOJA X 01/04", 150.0),
+        )
+    )
+
+    assert len(updated) == 3
+    assert len(tracker.purchases) == 3
+    assert tracker.projection() == {
+        "2025-06": 15000,
+        "2025-07": 15000,
+        "2025-08": 15000,
+    }
+    assert tracker.projection(after=date(2025, 6, 10)) == {
+        "2025-07": 15000,
+        "2025-08": 15000,
+    }
+    assert [p.merchant for p in tracker.open_purchases()] == ["LOJA X"]
+
+    path = str(tmp_path / "installments.json")
+    tracker.save(path)
+    reloaded = InstallmentTracker.load(path)
+    assert reloaded.projection() == tracker.projection()
+    assert (
+        reloaded.add(_card_statement(date(2025, 5, 10), ("LOJA X 04/04", 150.0))) == []
+    )
@@ -0,0 +1,99 @@
+from statement_ingestor import BradescoCreditCardParser, NubankBankParser
+from statement_ingestor.metrics import NULL_METRICS, Metrics
+from benchmarks.pdf_factory import build_pdf
+
+BANK_SAMPLE = "anonymous_samples/nubank_bank_statement.csv"
+
+
+def test_stage_timings_are_exclusive(monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr(
+        "statement_ingestor.metrics.time.perf_counter", lambda: next(clock)
+    )
+    metrics = Metrics()
+
+    with metrics.stage("outer"):  # t=0
+        with metrics.stage("inner"):  # t=1
+            pass  # t=2
+    # t=3
+
+    assert metrics.seconds == {"outer": 2, "inner": 1}
+    assert metrics.calls == {"outer": 1, "inner": 1}
+
+
+def test_hooks_receive_stages_and_counts():
+    stages, counts = [], []
+    metrics = Metrics(
+        stage_hooks=[lambda name, seconds: stages.append(name)],
+        count_hooks=[lambda name, amount: counts.append((name, amount))],
+    )
+
+    with metrics.stage("extract"):
+        metrics.count("pages", 2)
+
+    assert stages == ["extract"]
+    assert counts == [("pages", 2)]
+
+
+def test_bradesco_metrics(tmp_path):
+    pdf_file = tmp_path / "statement.pdf"
+    pdf_file.write_bytes(
+        build_pdf(
+            [
+                ["VENCIMENTO 01/04/2025", "JOHN DOE Cartão 4066 XXXX XXXX 1234"],
+                ["06/03 COMPRA 1,00", "31/02 DATA INVALIDA 2,00", "07/03 OUTRA 3,00"],
+            ]
+        )
+    )
+    metrics = Metrics()
+
+    statement = BradescoCreditCardParser(metrics=metrics, skip_invalid=True).parse(
+        str(pdf_file)
+    )
+
+    assert len(statement.transactions) == 2
+    assert metrics.counters == {
+        "pages": 2,
+        "rows": 5,
+        "rejected_lines": 1,
+        "transactions": 2,
+    }
+    assert set(metrics.seconds) == {"open", "extract", "parse", "build"}
+    assert metrics.calls["extract"] == 2
+
+
+def test_nubank_metrics_export():
+    metrics = Metrics()
+    statement = NubankBankParser(metrics=metrics).parse(BANK_SAMPLE)
+    count = len(statement.transactions)
+
+    exported = metrics.to_dict()
+    assert exported["counters"] == {"rows": count, "transactions": count}
+    assert set(exported["stages"]) == {"parse", "build"}
+
+    text = metrics.to_prometheus(labels={"parser": "nubank-bank"})
+    assert "# TYPE statement_ingestor_stage_seconds_total counter" in text
+    assert (
+        'statement_ingestor_stage_calls_total{parser="nubank-bank",stage="parse"} '
+        in text
+    )
+    assert f'statement_ingestor_rows_total{{parser="nubank-bank"}} {count}\n' in text
+
+
+def test_write_prometheus(tmp_path):
+    metrics = Metrics()
+    metrics.count("pages", 3)
+    path = tmp_path / "ingestion.prom"
+
+    metrics.write_prometheus(str(path))
+
+    assert path.read_text() == metrics.to_prometheus()
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_parsers_record_nothing_by_default():
+    parser = NubankBankParser()
+    parser.parse(BANK_SAMPLE)
+
+    assert parser.metrics is NULL_METRICS
+    assert NULL_METRICS.to_dict() == {"stages": {}, "counters": {}}
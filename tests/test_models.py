@@ -0,0 +1,79 @@
+from datetime import date
+from statement_ingestor.models import (
+    AccountType,
+    CompactTransaction,
+    Statement,
+    StatementBuilder,
+    Transaction,
+)
+from tests import make_transaction
+
+
+def test_statement_builder_tracks_date_range():
+    builder = StatementBuilder("test_account_id", AccountType.BANK)
+    transactions = [
+        make_transaction(date(2024, 3, 5), account_id="test_account_id"),
+        make_transaction(date(2024, 1, 2), account_id="test_account_id"),
+        make_transaction(date(2024, 7, 9), account_id="test_account_id"),
+    ]
+    builder.extend(transactions)
+
+    assert builder.build() == Statement(
+        account_id="test_account_id",
+        account_type=AccountType.BANK,
+        transactions=transactions,
+        start_date=date(2024, 1, 2),
+        end_date=date(2024, 7, 9),
+    )
+
+
+def test_statement_builder_empty():
+    builder = StatementBuilder("test_account_id", AccountType.CREDIT_CARD)
+
+    assert builder.build() == Statement(
+        account_id="test_account_id",
+        account_type=AccountType.CREDIT_CARD,
+        transactions=[],
+        start_date=None,
+        end_date=None,
+    )
+
+
+def test_compact_transaction_round_trip():
+    transaction = Transaction(
+        date=date(2024, 1, 2),
+        description="Padaria",
+        amount=-1234.56,
+        currency="BRL",
+        account_id="nubank_card_0000",
+    )
+
+    compact = CompactTransaction.from_transaction(transaction)
+
+    assert compact.amount_cents == -123456
+    assert compact.amount == -1234.56
+    assert compact.metadata is None
+    assert not hasattr(compact, "__dict__")
+    assert compact.to_transaction() == transaction
+
+
+def test_compact_transaction_interns_account_id():
+    first = CompactTransaction(
+        date(2024, 1, 2), "Padaria", 100, "BRL", "".join(["nubank_", "card"])
+    )
+    second = CompactTransaction(
+        date(2024, 1, 3), "Mercado", 200, "BRL", "".join(["nubank_", "card"])
+    )
+
+    assert first.account_id is second.account_id
+
+
+def test_compact_transactions_sum_exactly():
+    transactions = [
+        CompactTransaction.from_transaction(
+            Transaction(date(2024, 1, 1), "Compra", amount, "BRL", "test_account_id")
+        )
+        for amount in (0.1, 0.2)
+    ]
+
+    assert sum(t.amount_cents for t in transactions) == 30
@@ -1,7 +1,12 @@
+import io
 import pytest
 from datetime import datetime, date
 from statement_ingestor.models import AccountType, Statement, Transaction
 from statement_ingestor import NubankCreditCardParser, NubankBankParser
+from statement_ingestor.nubank import iter_columns, parse_dmy_date, parse_iso_date
+from statement_ingestor.nubank_bank_parser import Checkpoint
+
+BANK_SAMPLE_PATH = "anonymous_samples/nubank_bank_statement.csv"
 
 
 def test_parse_nubank_card_statement():
@@ -214,3 +219,106 @@ def test_parse_nubank_bank_statement_empty(tmp_path):
         end_date=None,
     )
     assert result == expected_statement
+
+
+def test_iter_nubank_card_transactions_is_lazy():
+    parser = NubankCreditCardParser()
+    transactions = parser.iter_transactions(
+        "anonymous_samples/nubank_card_statement.csv"
+    )
+
+    first = next(transactions)
+    assert first == Transaction(
+        date=date(2024, 1, 1),
+        description="Uber* Trip",
+        amount=15.50,
+        currency="BRL",
+        account_id="nubank_card_0000",
+    )
+    assert len(list(transactions)) == 9
+
+
+def test_iter_columns_matches_dict_reader_semantics():
+    rows = io.StringIO("Data,Valor,Valor\n01/02/2024,1.00,2.00\n\n03/02/2024\n")
+
+    assert list(iter_columns(rows, "Data", "Valor")) == [
+        ("01/02/2024", "2.00"),
+        ("03/02/2024", None),
+    ]
+
+
+def test_iter_columns_missing_column():
+    with pytest.raises(KeyError):
+        list(iter_columns(io.StringIO("date,title\n2024-01-01,Uber\n"), "amount"))
+    assert list(iter_columns(io.StringIO("date,title\n"), "amount")) == []
+
+
+def test_iter_columns_single_column_yields_tuples():
+    rows = io.StringIO("date,title\n2024-01-01,Uber\n2024-01-02\n")
+    assert list(iter_columns(rows, "title")) == [("Uber",), (None,)]
+
+
+def test_date_fast_paths_match_strptime():
+    assert parse_dmy_date("14/07/2024") == date(2024, 7, 14)
+    assert parse_dmy_date("1/7/2024") == date(2024, 7, 1)
+    assert parse_iso_date("2024-01-10") == date(2024, 1, 10)
+    with pytest.raises(ValueError):
+        parse_dmy_date("31/02/2024")
+    with pytest.raises(ValueError):
+        parse_iso_date("20240110")
+
+
+def test_parse_incremental_reads_only_appended_rows(tmp_path):
+    export = tmp_path / "export.csv"
+    header = "Data,Valor,Identificador,Descrição\n"
+    export.write_text(header + "01/02/2024,10.00,a,Padaria\n", encoding="utf-8")
+    parser = NubankBankParser()
+
+    first = parser.parse_incremental(str(export))
+    with open(export, "a", encoding="utf-8") as outfile:
+        outfile.write("02/02/2024,-5.50,b,Mercado\n03/02/2024,1.25,c,Pix\n")
+    checkpoint_file = tmp_path / "checkpoint.json"
+    first.checkpoint.save(str(checkpoint_file))
+    second = parser.parse_incremental(
+        str(export), Checkpoint.load(str(checkpoint_file))
+    )
+
+    assert first.full
+    assert [t.description for t in first.statement.transactions] == ["Padaria"]
+    assert not second.full
+    assert [t.description for t in second.statement.transactions] == [
+        "Mercado",
+        "Pix",
+    ]
+    assert second.statement.start_date == date(2024, 2, 2)
+    assert second.checkpoint.row_count == 3
+    assert second.checkpoint.offset == export.stat().st_size
+
+
+def test_parse_incremental_falls_back_when_prefix_changes(tmp_path):
+    export = tmp_path / "export.csv"
+    header = "Data,Valor,Identificador,Descrição\n"
+    export.write_text(header + "01/02/2024,10.00,a,Padaria\n", encoding="utf-8")
+    parser = NubankBankParser()
+    checkpoint = parser.parse_incremental(str(export)).checkpoint
+
+    export.write_text(
+        header + "01/02/2024,12.00,a,Padaria\n02/02/2024,-5.50,b,Mercado\n",
+        encoding="utf-8",
+    )
+    result = parser.parse_incremental(str(export), checkpoint)
+
+    assert result.full
+    assert result.statement == parser.parse(str(export))
+    assert result.checkpoint.row_count == 2
+
+
+def test_parse_incremental_without_new_rows():
+    parser = NubankBankParser()
+    checkpoint = parser.parse_incremental(BANK_SAMPLE_PATH).checkpoint
+
+    result = parser.parse_incremental(BANK_SAMPLE_PATH, checkpoint)
+
+    assert not result.full
+    assert result.statement.transactions == []
+    assert result.checkpoint == checkpoint
@@ -0,0 +1,65 @@
+from datetime import date
+from statement_ingestor import NubankBankParser, NubankCreditCardParser
+from statement_ingestor.reconcile import Reconciler, similarity
+from tests import make_transaction
+
+
+def test_matches_same_amount_within_window():
+    card = [
+        make_transaction(date(2025, 3, 6), -1234.56, "PAG BOLETO BANCARIO", "card"),
+        make_transaction(date(2025, 3, 20), -99.0, "PAG BOLETO BANCARIO", "card"),
+    ]
+    bank = [
+        make_transaction(date(2025, 3, 1), -1234.56, "Pagamento de fatura", "bank"),
+        make_transaction(date(2025, 3, 8), -1234.56, "Pagamento de fatura", "bank"),
+        make_transaction(date(2025, 3, 20), 99.0, "Estorno", "bank"),
+    ]
+
+    result = Reconciler(window_days=3).reconcile(card, bank)
+
+    assert result.matched == [(card[0], bank[1])]
+    assert result.unmatched_left == [card[1]]
+    assert result.unmatched_right == [bank[0], bank[2]]
+
+
+def test_each_transaction_is_matched_once_preferring_similar_descriptions():
+    card = [
+        make_transaction(date(2025, 3, 5), -50.0, "Pagamento recebido", "card"),
+        make_transaction(date(2025, 3, 5), -50.0, "Pagamento recebido", "card"),
+    ]
+    bank = [
+        make_transaction(date(2025, 3, 5), -50.0, "Pix Padaria", "bank"),
+        make_transaction(date(2025, 3, 6), -50.0, "Pagamento de fatura", "bank"),
+    ]
+
+    result = Reconciler(window_days=1).reconcile(card, bank)
+
+    assert [right for _, right in result.matched] == [bank[1], bank[0]]
+    strict = Reconciler(window_days=1, min_similarity=0.2).reconcile(card, bank)
+    assert [right for _, right in strict.matched] == [bank[1]]
+
+
+def test_opposite_sign():
+    card = [make_transaction(date(2025, 3, 5), 300.0, "Pagamento", "card")]
+    bank = [make_transaction(date(2025, 3, 5), -300.0, "Pagamento", "bank")]
+
+    assert Reconciler().reconcile(card, bank).matched == []
+    assert Reconciler(opposite_sign=True).reconcile(card, bank).matched == [
+        (card[0], bank[0])
+    ]
+
+
+def test_similarity():
+    assert similarity("Pagamento de Fatura", "PAGAMENTO FATURA") == 2 / 3
+    assert similarity("Pix", "Boleto") == 0
+
+
+def test_reconcile_parser_output():
+    card = NubankCreditCardParser().parse("anonymous_samples/nubank_card_statement.csv")
+    bank = NubankBankParser().parse("anonymous_samples/nubank_bank_statement.csv")
+    payments = [t for t in card.transactions if t.amount < 0]
+
+    result = Reconciler(window_days=5).reconcile(payments, bank.transactions)
+
+    assert len(result.matched) + len(result.unmatched_left) == len(payments)
+    assert len(result.matched) + len(result.unmatched_right) == len(bank.transactions)
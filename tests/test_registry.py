@@ -0,0 +1,75 @@
+import pytest
+from unittest.mock import patch
+from statement_ingestor import (
+    BradescoCreditCardParser,
+    NubankBankParser,
+    NubankCreditCardParser,
+    ingest,
+    ingest_many,
+    sniff,
+)
+from statement_ingestor.registry import parser_for_name
+from benchmarks.pdf_factory import build_pdf
+
+BANK_SAMPLE = "anonymous_samples/nubank_bank_statement.csv"
+CARD_SAMPLE = "anonymous_samples/nubank_card_statement.csv"
+
+
+def test_sniff_csv_headers():
+    assert sniff(BANK_SAMPLE) is NubankBankParser
+    assert sniff(CARD_SAMPLE) is NubankCreditCardParser
+
+
+def test_sniff_bradesco_pdf(tmp_path):
+    statement = tmp_path / "statement.pdf"
+    statement.write_bytes(build_pdf([["JOHN DOE Cartão 4066 XXXX XXXX 1234"]]))
+    other_pdf = tmp_path / "other.pdf"
+    other_pdf.write_bytes(build_pdf([["Boleto"]]))
+
+    assert sniff(str(statement)) is BradescoCreditCardParser
+    assert sniff(str(other_pdf)) is None
+
+
+def test_sniff_reads_only_the_head():
+    with patch.object(NubankBankParser, "iter_transactions") as iter_transactions:
+        assert sniff(BANK_SAMPLE) is NubankBankParser
+    iter_transactions.assert_not_called()
+
+
+def test_ingest_dispatches_by_format(tmp_path):
+    unknown = tmp_path / "unknown.txt"
+    unknown.write_text("hello")
+
+    assert ingest(CARD_SAMPLE) == NubankCreditCardParser().parse(CARD_SAMPLE)
+    with pytest.raises(ValueError):
+        ingest(str(unknown))
+
+
+def test_ingest_parses_what_sniff_detects(tmp_path):
+    with open(BANK_SAMPLE, "rb") as infile:
+        content = infile.read()
+    with_bom = tmp_path / "bom.csv"
+    with_bom.write_bytes(b"\xef\xbb\xbf" + content)
+    header, rest = content.split(b"\n", 1)
+    padded = tmp_path / "padded.csv"
+    padded.write_bytes(header.replace(b",", b", ") + b"\n" + rest)
+
+    expected = NubankBankParser().parse(BANK_SAMPLE)
+    for path in (str(with_bom), str(padded)):
+        assert sniff(path) is NubankBankParser
+        assert ingest(path) == expected
+
+
+def test_ingest_many_without_parser():
+    results = list(ingest_many([BANK_SAMPLE, CARD_SAMPLE], workers=1))
+
+    assert [r.statement.account_id for r in results] == [
+        "nubank_bank_0000",
+        "nubank_card_0000",
+    ]
+
+
+def test_parser_for_name():
+    assert parser_for_name("bradesco-card") is BradescoCreditCardParser
+    with pytest.raises(ValueError):
+        parser_for_name("itau-card")
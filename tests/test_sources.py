@@ -0,0 +1,84 @@
+import io
+import mmap
+from statement_ingestor import (
+    BradescoCreditCardParser,
+    NubankBankParser,
+    NubankCreditCardParser,
+    ingest,
+    sniff,
+)
+from statement_ingestor.cache import file_digest
+from statement_ingestor.sources import open_binary, read_head
+from benchmarks.pdf_factory import build_pdf
+
+BANK_SAMPLE = "anonymous_samples/nubank_bank_statement.csv"
+CARD_SAMPLE = "anonymous_samples/nubank_card_statement.csv"
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as infile:
+        return infile.read()
+
+
+def test_csv_parsers_accept_in_memory_sources():
+    content = _read(BANK_SAMPLE)
+    expected = NubankBankParser().parse(BANK_SAMPLE)
+
+    with open(BANK_SAMPLE, "rb") as infile, mmap.mmap(
+        infile.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        assert NubankBankParser().parse(mapped) == expected
+
+    assert NubankBankParser().parse(content) == expected
+    assert NubankBankParser().parse(memoryview(content)) == expected
+    assert NubankBankParser().parse(bytearray(content)) == expected
+    assert NubankBankParser().parse(io.BytesIO(content)) == expected
+
+
+def test_file_objects_are_left_open():
+    stream = io.BytesIO(_read(CARD_SAMPLE))
+
+    statement = NubankCreditCardParser().parse(stream)
+
+    assert not stream.closed
+    assert len(statement.transactions) == 10
+
+
+def test_bradesco_parser_accepts_bytes():
+    content = build_pdf(
+        [
+            ["VENCIMENTO 01/04/2025", "JOHN DOE Cartão 4066 XXXX XXXX 1234"],
+            ["06/03 PAG BOLETO BANCARIO 1.234,56-"],
+        ]
+    )
+
+    statement = BradescoCreditCardParser(workers=2).parse(content)
+
+    assert [t.amount for t in statement.transactions] == [-1234.56]
+
+
+def test_sniff_restores_file_object_position():
+    stream = io.BytesIO(_read(CARD_SAMPLE))
+
+    assert sniff(stream) is NubankCreditCardParser
+    assert stream.tell() == 0
+    assert ingest(stream) == NubankCreditCardParser().parse(CARD_SAMPLE)
+
+
+def test_memory_reader_seeks_within_buffer():
+    content = bytearray(b"0123456789")
+
+    with open_binary(content) as stream:
+        stream.seek(-3, io.SEEK_END)
+        assert stream.read() == b"789"
+        stream.seek(2)
+        assert stream.read(3) == b"234"
+
+    assert read_head(memoryview(content), 4) == b"0123"
+
+
+def test_file_digest_matches_across_sources():
+    content = _read(CARD_SAMPLE)
+
+    assert file_digest(CARD_SAMPLE) == file_digest(content)
+    assert file_digest(io.BytesIO(content)) == file_digest(memoryview(content))
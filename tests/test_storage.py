@@ -0,0 +1,66 @@
+import pytest
+from datetime import date
+from statement_ingestor.models import AccountType
+from statement_ingestor.storage import SQLiteStore
+from tests import make_statement, make_transaction
+
+
+def test_upsert_is_idempotent(tmp_path):
+    store = SQLiteStore(str(tmp_path / "history.sqlite"))
+    coffee = make_transaction(date(2025, 3, 6), 7.5, "PADARIA", "card_1234")
+    statement = make_statement(
+        coffee, coffee, make_transaction(date(2025, 3, 7), 12.0, "PADARIA", "card_1234")
+    )
+
+    assert store.upsert(statement) == 3
+    store.upsert(statement)
+    store.upsert(
+        make_statement(
+            make_transaction(
+                date(2025, 3, 7), 12.0, "PADARIA", "card_1234", category="food"
+            )
+        )
+    )
+
+    assert len(store) == 3
+    stored = store.query("card_1234")
+    assert stored.account_type == AccountType.CREDIT_CARD
+    assert [t.amount for t in stored.transactions] == [7.5, 7.5, 12.0]
+    assert stored.transactions[2].category == "food"
+    store.close()
+
+
+def test_query_by_account_and_date_window(tmp_path):
+    path = str(tmp_path / "history.sqlite")
+    store = SQLiteStore(path)
+    store.upsert(
+        make_statement(
+            make_transaction(
+                date(2025, 3, 9),
+                3.0,
+                "PADARIA",
+                "card_1234",
+                metadata={"installment": 1},
+            ),
+            make_transaction(date(2025, 3, 1), 1.0, "PADARIA", "card_1234"),
+            make_transaction(date(2025, 3, 5), 2.0, "PADARIA", "card_1234"),
+            make_transaction(date(2025, 3, 5), 9.0, "PADARIA", "card_5678"),
+        )
+    )
+    store.close()
+
+    reopened = SQLiteStore(path)
+    statement = reopened.query("card_1234", date(2025, 3, 5), date(2025, 3, 9))
+
+    assert [t.amount for t in statement.transactions] == [2.0, 3.0]
+    assert statement.transactions[1].metadata == {"installment": 1}
+    assert (statement.start_date, statement.end_date) == (
+        date(2025, 3, 5),
+        date(2025, 3, 9),
+    )
+    assert reopened.accounts() == {
+        "card_1234": AccountType.CREDIT_CARD,
+        "card_5678": AccountType.CREDIT_CARD,
+    }
+    with pytest.raises(ValueError):
+        reopened.query("unknown")
@@ -0,0 +1,57 @@
+from datetime import date
+from statement_ingestor.models import Transaction
+from statement_ingestor.summary import Aggregate, SummaryIndex
+from tests import make_statement
+
+FIRST = make_statement(
+    Transaction(date(2025, 1, 5), "Padaria", -12.5, "BRL", "nubank_bank_0000", "food"),
+    Transaction(date(2025, 1, 20), "Mercado", -80.1, "BRL", "nubank_bank_0000", "food"),
+    Transaction(date(2025, 2, 1), "Salario", 1000.0, "BRL", "nubank_bank_0000"),
+)
+SECOND = make_statement(
+    Transaction(date(2025, 2, 3), "Uber", -23.45, "BRL", "nubank_bank_0000", "ride"),
+    Transaction(date(2025, 3, 3), "Padaria", -7.0, "BRL", "card_1234", "food"),
+)
+
+
+def test_monthly_aggregates_in_cents():
+    index = SummaryIndex.rebuild([FIRST, SECOND])
+
+    assert index.accounts() == ["card_1234", "nubank_bank_0000"]
+    assert index.monthly("nubank_bank_0000") == {
+        "2025-01": Aggregate(-9260, 2, -8010, -1250),
+        "2025-02": Aggregate(97655, 2, -2345, 100000),
+    }
+    assert list(index.monthly("nubank_bank_0000", start=date(2025, 2, 28))) == [
+        "2025-02"
+    ]
+    assert index.monthly("nubank_bank_0000", end=date(2024, 12, 31)) == {}
+    assert index.by_category("nubank_bank_0000", "2025-02") == {
+        None: Aggregate(100000, 1, 100000, 100000),
+        "ride": Aggregate(-2345, 1, -2345, -2345),
+    }
+
+
+def test_merge_matches_single_index():
+    merged = SummaryIndex.rebuild([FIRST])
+    merged.merge(SummaryIndex.rebuild([SECOND]))
+
+    single = SummaryIndex.rebuild([FIRST, SECOND])
+    for account_id in single.accounts():
+        assert merged.monthly(account_id) == single.monthly(account_id)
+    assert merged.by_category("nubank_bank_0000", "2025-02") == single.by_category(
+        "nubank_bank_0000", "2025-02"
+    )
+
+
+def test_save_and_load(tmp_path):
+    index = SummaryIndex.rebuild([FIRST, SECOND.transactions])
+    path = str(tmp_path / "summary.json")
+    index.save(path)
+
+    loaded = SummaryIndex.load(path)
+
+    assert loaded.monthly("nubank_bank_0000") == index.monthly("nubank_bank_0000")
+    assert loaded.by_category("card_1234", "2025-03") == {
+        "food": Aggregate(-700, 1, -700, -700)
+    }